@@ -1,13 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+from glob import glob
 
 
 block_cipher = None
 
+# Every image but the asset pack, which may be left from an older bake. The one dir build ships the png files
+images_datas = [(path, os.path.dirname(path)) for path in glob(os.path.join('Images', '**', '*'), recursive=True)
+                if os.path.isfile(path) and os.path.basename(path) != 'assets.pack']
+
 
 a = Analysis(['main.py'],
              pathex=[],
              binaries=[],
-             datas=[('Images/', 'Images'), ('Music/', 'Music'), ('configurations/', 'configurations')],
+             datas=images_datas + [('Music/', 'Music'), ('configurations/', 'configurations')],
              hiddenimports=[],
              hookspath=[],
              hooksconfig={},
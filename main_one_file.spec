@@ -1,13 +1,25 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+sys.path.insert(0, SPECPATH)
+from scripts.asset_pack import is_asset_pack_up_to_date
 
 
 block_cipher = None
 
+# Once the assets are baked (python -m scripts.asset_pack), only the pack is shipped instead of every png. A pack older
+# than the png files is not shipped
+if is_asset_pack_up_to_date('Images'):
+    images_datas = [('Images/assets.pack', 'Images'), ('Images/logo.ico', 'Images')]
+else:
+    images_datas = [('Images/', 'Images')]
+
 
 a = Analysis(['main.py'],
              pathex=[],
              binaries=[],
-             datas=[('Images/', 'Images'), ('Music/', 'Music'), ('configurations/', 'configurations'), ('Fonts/', 'Fonts'),
+             datas=images_datas + [('Music/', 'Music'), ('configurations/', 'configurations'), ('Fonts/', 'Fonts'),
              ('scripts/', 'scripts')],
              hiddenimports=[],
              hookspath=[],
@@ -0,0 +1,33 @@
+from array import array
+
+
+class AnimationClip:
+
+    def __init__(self, images, frame_duration):
+        """
+        Animation that keeps each decoded image once and maps every tick of the animation to one of them.
+        :param images: list with the images of the animation in order. They are only kept until they are packed
+        :param frame_duration: number of ticks that each image is shown
+        """
+        self.images = images
+        self.sheet = None
+        self.areas = [image.get_rect() for image in images]
+        self.frame_duration = frame_duration
+        self.frame_index = array('H', [index for index in range(len(images)) for _ in range(frame_duration)])
+
+    def __len__(self):
+        return len(self.frame_index)
+
+    def get_area(self, tick):
+        return self.areas[self.frame_index[tick]]
+
+    def pack(self, sheet, areas):
+        """
+        Moves the clip images to a shared sheet. The clip is drawn by blitting the area of the sheet of each tick, so the
+        separate images are dropped.
+        :param sheet: surface that contains the images of the clip
+        :param areas: rects of the sheet with each image of the clip, in the same order as the images
+        """
+        self.sheet = sheet
+        self.areas = areas
+        self.images = None
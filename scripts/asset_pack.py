@@ -0,0 +1,148 @@
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import warnings
+from glob import glob
+
+import pygame
+
+PACK_FILE_NAME = 'assets.pack'
+PACK_MAGIC = b'SGPACK01'
+HEADER_LENGTH_FORMAT = '<I'
+
+
+def get_pack_key(root_dir, path):
+    return pathlib.Path(os.path.relpath(path, root_dir)).as_posix()
+
+
+def get_png_sources(img_dir):
+    """ Returns the modification time (in ns) and size of every png of the images directory by its pack key. """
+    sources = {}
+    for img_path in glob(os.path.join(img_dir, '**', '*.png'), recursive=True):
+        img_stat = os.stat(img_path)
+        sources[get_pack_key(img_dir, img_path)] = [img_stat.st_mtime_ns, img_stat.st_size]
+    return sources
+
+
+def bake_assets(img_dir, pack_path=None):
+    """
+    Decodes every png of the images directory and writes its RGBA pixels into one pack file. The header keeps, for
+    every image, its offset and size and, for every directory, its images in the same order that glob returns them. It
+    also keeps the modification time and size of every png, to know if the pack is stale.
+    :param img_dir: images directory
+    :param pack_path: path of the pack file. By default, the pack is written inside the images directory
+    :return: the path of the pack file
+    """
+    pack_path = pack_path if pack_path is not None else os.path.join(img_dir, PACK_FILE_NAME)
+    images = {}
+    dirs = {}
+    pixel_chunks = []
+    offset = 0
+    for directory in sorted({os.path.dirname(path) for path in glob(os.path.join(img_dir, '**', '*.png'),
+                                                                    recursive=True)}):
+        dir_keys = []
+        for img_path in glob(os.path.join(directory, '*.png')):
+            image = pygame.image.load(img_path)
+            pixels = pygame.image.tobytes(image, 'RGBA')
+            key = get_pack_key(img_dir, img_path)
+            images[key] = [offset, image.get_width(), image.get_height()]
+            pixel_chunks.append(pixels)
+            offset += len(pixels)
+            dir_keys.append(key)
+        dirs[get_pack_key(img_dir, directory)] = dir_keys
+
+    header = json.dumps({'images': images, 'dirs': dirs, 'sources': get_png_sources(img_dir)}).encode('utf-8')
+    with open(pack_path, 'wb') as pack_file:
+        pack_file.write(PACK_MAGIC)
+        pack_file.write(struct.pack(HEADER_LENGTH_FORMAT, len(header)))
+        pack_file.write(header)
+        for pixels in pixel_chunks:
+            pack_file.write(pixels)
+    return pack_path
+
+
+class AssetPack:
+
+    def __init__(self, pack_path, img_dir):
+        """
+        Baked images memory-mapped from a pack file. The surfaces are built over the mapped pixels, without decoding.
+        :param pack_path: path of the pack file made by bake_assets
+        :param img_dir: images directory that was baked. The image paths are resolved relative to it
+        """
+        self.img_dir = img_dir
+        with open(pack_path, 'rb') as pack_file:
+            self.buffer = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.buffer[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f'{pack_path} is not an asset pack')
+        header_start = len(PACK_MAGIC) + struct.calcsize(HEADER_LENGTH_FORMAT)
+        header_length = struct.unpack_from(HEADER_LENGTH_FORMAT, self.buffer, len(PACK_MAGIC))[0]
+        header = json.loads(self.buffer[header_start:header_start + header_length].decode('utf-8'))
+        self.data_start = header_start + header_length
+        self.images = header['images']
+        self.dirs = header['dirs']
+        # None in the packs baked before the sources were kept
+        self.sources = header.get('sources')
+
+    def is_up_to_date(self, png_sources=None):
+        """
+        Returns whether the png files are the same (name, modification time and size) as when it was baked.
+        :param png_sources: get_png_sources of the images directory, if they have already been read
+        """
+        png_sources = png_sources if png_sources is not None else get_png_sources(self.img_dir)
+        return self.sources == png_sources
+
+    def close(self):
+        self.buffer.close()
+
+    def list_images(self, img_dir):
+        return [os.path.join(self.img_dir, *key.split('/'))
+                for key in self.dirs.get(get_pack_key(self.img_dir, img_dir), [])]
+
+    def contains(self, img_path):
+        return get_pack_key(self.img_dir, img_path) in self.images
+
+    def load(self, img_path):
+        offset, width, height = self.images[get_pack_key(self.img_dir, img_path)]
+        start = self.data_start + offset
+        return pygame.image.frombuffer(memoryview(self.buffer)[start:start + width * height * 4], (width, height),
+                                       'RGBA')
+
+
+def is_asset_pack_up_to_date(img_dir):
+    """ Returns whether the images directory has a pack baked from its current png files. It is used by the specs. """
+    pack_path = os.path.join(img_dir, PACK_FILE_NAME)
+    if not os.path.exists(pack_path):
+        return False
+    asset_pack = AssetPack(pack_path, img_dir)
+    is_up_to_date = asset_pack.is_up_to_date()
+    asset_pack.close()
+    return is_up_to_date
+
+
+def open_asset_pack(img_dir):
+    """
+    Returns the AssetPack of the images directory or None if the assets have not been baked. The pack is not used
+    either if a png has been added, removed or changed since it was baked, so the png files are decoded. Without png
+    files (the one file build only ships the pack), the pack is used as it is.
+    """
+    pack_path = os.path.join(img_dir, PACK_FILE_NAME)
+    if not os.path.exists(pack_path):
+        return None
+    asset_pack = AssetPack(pack_path, img_dir)
+    png_sources = get_png_sources(img_dir)
+    if not png_sources or asset_pack.is_up_to_date(png_sources):
+        return asset_pack
+    asset_pack.close()
+    warnings.warn(f'{pack_path} is older than the png files, so they are decoded. Bake it again with '
+                  f'"python -m scripts.asset_pack"')
+    return None
+
+
+if __name__ == '__main__':
+    # python -m scripts.asset_pack [images directory]
+    images_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(pathlib.Path(__file__).parent.parent, 'Images')
+    print(f'Asset pack written in {bake_assets(images_dir)}')
@@ -0,0 +1,71 @@
+import pygame
+
+
+def get_database_clips(animation_database):
+    """ Returns the animation clips of an animation database, going through its nested dictionaries. """
+    if isinstance(animation_database, dict):
+        clips = []
+        for value in animation_database.values():
+            clips.extend(get_database_clips(value))
+        return clips
+    return [animation_database]
+
+
+def shelf_pack(sizes, max_width):
+    """
+    Places rectangles in rows (shelves) from the tallest to the shortest one.
+    :param sizes: list of (width, height) of the rectangles to place
+    :param max_width: maximum width of the sheet, unless one rectangle is wider
+    :return: the (width, height) of the sheet and the list of rects in the same order as sizes
+    """
+    sheet_width = max([max_width] + [width for width, _ in sizes])
+    rects = [None] * len(sizes)
+    x, y, shelf_height, used_width = 0, 0, 0, 0
+    for index in sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True):
+        width, height = sizes[index]
+        if x + width > sheet_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        rects[index] = pygame.Rect(x, y, width, height)
+        x += width
+        used_width = max(used_width, x)
+        shelf_height = max(shelf_height, height)
+    return (used_width, y + shelf_height), rects
+
+
+def convert_sheet(sheet):
+    """
+    Converts a sheet to the display format with alpha and run length encoding (RLE). Most of a sheet is transparent,
+    and the RLE blits skip the transparent pixels. Without display (headless mode), the sheet is kept as it is.
+    """
+    if pygame.display.get_surface() is None:
+        return sheet
+    sheet = sheet.convert_alpha()
+    sheet.set_alpha(255, pygame.RLEACCEL)
+    return sheet
+
+
+def pack_animation_database(animation_database, max_width=512):
+    """
+    Packs every image of the clips of the database into one sheet and moves the clips to that sheet, so the whole
+    entity is drawn from a single surface.
+    :param animation_database: AnimationClip or nested dictionaries of AnimationClip
+    :param max_width: maximum width of the sheet
+    :return: the sheet
+    """
+    clips = get_database_clips(animation_database)
+    images = [image for clip in clips for image in clip.images]
+    sheet_size, rects = shelf_pack([image.get_size() for image in images], max_width)
+
+    sheet = pygame.Surface(sheet_size, pygame.SRCALPHA, 32)
+    sheet.fill((0, 0, 0, 0))
+    # Max blending over a transparent sheet copies the pixels, alpha included, without blending them
+    sheet.blits([(image, rect, None, pygame.BLEND_RGBA_MAX) for image, rect in zip(images, rects)], doreturn=False)
+    sheet = convert_sheet(sheet)
+
+    first_rect = 0
+    for clip in clips:
+        clip.pack(sheet, rects[first_rect:first_rect + len(clip.areas)])
+        first_rect += len(clip.areas)
+    return sheet
@@ -0,0 +1,196 @@
+import configparser
+import json
+import os
+import pickle
+from dataclasses import dataclass, fields
+from typing import Dict, Tuple
+
+CONFIG_FILE_NAME = 'configuration_file.cfg'
+CACHE_FILE_NAME = 'configuration_file.cache'
+# Increase it when the parsing changes, so the old caches are not used. The schema changes are already detected by
+# get_schema_key
+CACHE_VERSION = 5
+
+PROJECTILE_SECTIONS = ['AIR', 'FIRE', 'WATER', 'DARKNESS', 'LIGHT']
+GENERAL_SECTIONS = ['PJ', 'SCREEN', 'RENDER', 'SIMULATION', 'MUSIC']
+
+
+@dataclass(frozen=True)
+class Constants:
+
+    @classmethod
+    def from_section(cls, section_name, section):
+        """
+        Validates the raw values of a configuration section against the field types of the class.
+        :param section_name: name of the section, used in the error messages
+        :param section: dict with the raw string values of the section
+        """
+        schema = {field.name: field.type for field in fields(cls)}
+        unknown_keys = set(section) - set(schema)
+        missing_keys = set(schema) - set(section)
+        if unknown_keys or missing_keys:
+            raise ValueError(f'[{section_name}] has unknown keys {sorted(unknown_keys)} '
+                             f'and missing keys {sorted(missing_keys)}')
+
+        values = {}
+        for key, value_type in schema.items():
+            try:
+                values[key] = parse_value(section[key], value_type)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f'[{section_name}] {key} = {section[key]} is not a valid {value_type}') from e
+        return cls(**values)
+
+    def as_kwargs(self):
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+def parse_value(raw_value, value_type):
+    if value_type is int:
+        return int(raw_value)
+    elif value_type is float:
+        return float(raw_value)
+    elif value_type is bool:
+        if raw_value.lower() not in configparser.RawConfigParser.BOOLEAN_STATES:
+            raise ValueError('it must be true or false')
+        return configparser.RawConfigParser.BOOLEAN_STATES[raw_value.lower()]
+    elif value_type == Tuple[int, int]:
+        value = json.loads(raw_value)
+        if not (isinstance(value, list) and len(value) == 2 and all(isinstance(item, int) for item in value)):
+            raise ValueError('it must be a list of two integers')
+        return tuple(value)
+    raise TypeError(f'{value_type} is not supported in the configuration schema')
+
+
+@dataclass(frozen=True)
+class PjConstants(Constants):
+    width: int
+    height: int
+    vel: float
+    damage: int
+    base_attack_range: Tuple[int, int]
+    hp: int
+    frame_duration: int
+
+
+@dataclass(frozen=True)
+class EnemyConstants(Constants):
+    width: int
+    height: int
+    vel: float
+    vision: float
+    damage: int
+    base_attack_range: Tuple[int, int]
+    hp: int
+    frame_duration: int
+
+
+@dataclass(frozen=True)
+class ProjectileConstants(Constants):
+    lifetime: int
+    width: int
+    height: int
+    vel: float
+    damage: int
+    frame_duration: int
+
+
+@dataclass(frozen=True)
+class ScreenConstants(Constants):
+    win_x: int
+    win_y: int
+    dun_win_x: int
+    dun_win_y: int
+    win_inf_border_x: int
+    win_inf_border_y: int
+    dun_border_x: int
+    dun_border_y: int
+
+
+@dataclass(frozen=True)
+class RenderConstants(Constants):
+    dirty_rect_rendering: bool
+    fixed_timestep: bool
+    max_render_fps: int
+    interpolation: bool
+    pipelined_present: bool
+
+
+@dataclass(frozen=True)
+class SimulationConstants(Constants):
+    vectorized_projectiles: bool
+
+
+@dataclass(frozen=True)
+class MusicConstants(Constants):
+    vol_ratio_hit: float
+    vol_ratio_mons_dead: float
+    vol_ratio_att: float
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    pj: PjConstants
+    enemies: Dict[str, EnemyConstants]
+    projectiles: Dict[str, ProjectileConstants]
+    screen: ScreenConstants
+    render: RenderConstants
+    simulation: SimulationConstants
+    music: MusicConstants
+
+
+def get_schema_key():
+    """ Returns the field names and types of GameConfig and of every constants class, to tell when they change. """
+    schema_classes = [GameConfig] + sorted(Constants.__subclasses__(), key=lambda cls: cls.__name__)
+    return tuple((cls.__name__, tuple((field.name, str(field.type)) for field in fields(cls)))
+                 for cls in schema_classes)
+
+
+def parse_game_config(config_path):
+    """
+    Parses the configuration file. The PJ, SCREEN, RENDER, SIMULATION, MUSIC and projectile element sections have their
+    own schema and every other section is an enemy. The enemies and elements are keyed in lowercase.
+    """
+    raw_configparser = configparser.RawConfigParser()
+    with open(config_path, 'r') as config_file:
+        raw_configparser.read_file(config_file)
+    sections = {name: dict(raw_configparser.items(name)) for name in raw_configparser.sections()}
+
+    enemy_sections = [name for name in sections if name not in GENERAL_SECTIONS + PROJECTILE_SECTIONS]
+    return GameConfig(
+        pj=PjConstants.from_section('PJ', sections['PJ']),
+        enemies={name.lower(): EnemyConstants.from_section(name, sections[name]) for name in enemy_sections},
+        projectiles={name.lower(): ProjectileConstants.from_section(name, sections[name])
+                     for name in PROJECTILE_SECTIONS},
+        screen=ScreenConstants.from_section('SCREEN', sections['SCREEN']),
+        render=RenderConstants.from_section('RENDER', sections['RENDER']),
+        simulation=SimulationConstants.from_section('SIMULATION', sections['SIMULATION']),
+        music=MusicConstants.from_section('MUSIC', sections['MUSIC']))
+
+
+def load_game_config(path):
+    """
+    Returns the GameConfig of the configuration file in path. The parsed configuration is cached in a file next to
+    it and reused while the configuration file modification time does not change.
+    """
+    config_path = os.path.join(path, CONFIG_FILE_NAME)
+    cache_path = os.path.join(path, CACHE_FILE_NAME)
+    config_stat = os.stat(config_path)
+    cache_key = (CACHE_VERSION, get_schema_key(), config_stat.st_mtime_ns, config_stat.st_size)
+
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cached_key, game_config = pickle.load(cache_file)
+        if cached_key == cache_key:
+            return game_config
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        # Caches of older versions can refer to modules or classes that do not exist anymore
+        pass
+
+    game_config = parse_game_config(config_path)
+    try:
+        with open(cache_path, 'wb') as cache_file:
+            pickle.dump((cache_key, game_config), cache_file)
+    except OSError:
+        # The configurations directory can be read only (e.g. packaged game), the cache is only an optimization
+        pass
+    return game_config
@@ -0,0 +1,88 @@
+import pygame
+
+from scripts.atlas import convert_sheet, get_database_clips
+
+
+def get_display_format():
+    """ Returns the bitsize and masks of the window pixels or None without window (headless mode). """
+    display_surface = pygame.display.get_surface()
+    if display_surface is None:
+        return None
+    return display_surface.get_bitsize(), display_surface.get_masks()
+
+
+def is_opaque(image):
+    if image.get_colorkey() is not None:
+        return False
+    if not image.get_flags() & pygame.SRCALPHA:
+        return True
+    width, height = image.get_size()
+    return pygame.mask.from_surface(image, threshold=254).count() == width * height
+
+
+def convert_image(image):
+    """
+    Converts the image to the display format. The opaque images (like the backgrounds) are converted without alpha,
+    so they are blitted as a plain copy. Without display (headless mode), the image is kept as it is.
+    """
+    if pygame.display.get_surface() is None:
+        return image
+    if is_opaque(image):
+        return image.convert()
+    return image.convert_alpha()
+
+
+class AssetPreparer:
+
+    def __init__(self):
+        """
+        Keeps the loaded images in the display format. set_mode can change the display format, and then every loaded
+        image is converted again, so the blits do not need to convert the pixels every frame.
+        """
+        self.display_format = None
+        # Increased every time the images are converted again. The surfaces made from them must be made again
+        self.version = 0
+        self.animation_databases = []
+        self.image_databases = []
+
+    def add_animation_database(self, animation_database):
+        """ :param animation_database: AnimationClip or nested dictionaries of AnimationClip """
+        self.animation_databases.append(animation_database)
+
+    def add_image_database(self, image_database):
+        """ :param image_database: nested dictionaries of images """
+        self.image_databases.append(image_database)
+
+    def prepare(self):
+        """ It is run after set_mode. The images are only converted again if the display format has changed. """
+        display_format = get_display_format()
+        if display_format is None or display_format == self.display_format:
+            return
+        if self.display_format is not None:
+            for animation_database in self.animation_databases:
+                self.convert_animation_database(animation_database)
+            for image_database in self.image_databases:
+                self.convert_image_database(image_database, {})
+            self.version += 1
+        self.display_format = display_format
+
+    @staticmethod
+    def convert_animation_database(animation_database):
+        converted_sheets = {}
+        for clip in get_database_clips(animation_database):
+            if id(clip.sheet) not in converted_sheets:
+                converted_sheets[id(clip.sheet)] = convert_sheet(clip.sheet)
+            clip.pack(converted_sheets[id(clip.sheet)], clip.areas)
+
+    def convert_image_database(self, image_database, converted_images):
+        """ The images are replaced in place. An image found in several keys is converted once. """
+        for key, value in image_database.items():
+            if isinstance(value, dict):
+                self.convert_image_database(value, converted_images)
+            else:
+                if id(value) not in converted_images:
+                    converted_images[id(value)] = convert_image(value)
+                image_database[key] = converted_images[id(value)]
+
+
+asset_preparer = AssetPreparer()
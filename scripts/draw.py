@@ -1,8 +1,14 @@
+import queue
+import threading
 from abc import ABC, abstractmethod
 
 import pygame
-from scripts.variables import (WIN_X, WIN_Y, DUN_WIN_X, DUN_WIN_Y, bg_img_database, 
-                               WIN_INF_BORDER_X, WIN_INF_BORDER_Y, screen_sizes, fonts_mapper)
+from scripts.fonts import text_cache
+from scripts.variables import (WIN_X, WIN_Y, DUN_WIN_X, DUN_WIN_Y, WIN_INF_BORDER_X, WIN_INF_BORDER_Y, screen_sizes,
+                               fonts_mapper, render_constants, display_lock, HEADLESS)
+
+# Longer moves between two ticks, like crossing a door, are drawn without interpolation
+MAX_INTERPOLATION_DISTANCE = 32
 
 
 class RunDrawHandler(ABC):
@@ -10,18 +16,221 @@ class RunDrawHandler(ABC):
     def __init__(self, screen):
         self.screen = screen
 
-    @staticmethod
-    def set_priority_objects_order_list(pj, enemies, objects):
-        objects_to_draw = objects + enemies + [pj]
-        return objects_to_draw
-
     @abstractmethod
     def draw_run(self, **kwargs):
         pass
 
 
+class ScreenPresenter:
+
+    def __init__(self):
+        """
+        Scales the intermediate screen (WIN_X x WIN_Y) to the window without allocating a surface every frame.
+        It is scaled straight into the window, at any size. Only if the window has other pixel format, it is scaled
+        into a cached surface with the format of the intermediate screen, which is reused while the size is kept.
+        """
+        self.scaled_screen = None
+
+    @staticmethod
+    def get_integer_scale(screen):
+        """ Returns the integer scale between the screen and the intermediate screen or None if it is not integer. """
+        screen_width, screen_height = screen.get_size()
+        scale = screen_width // WIN_X
+        if scale >= 1 and screen_width == scale * WIN_X and screen_height == scale * WIN_Y:
+            return scale
+        return None
+
+    def present(self, intermediate_screen, screen):
+        screen_size = screen.get_size()
+        if screen.get_bitsize() == intermediate_screen.get_bitsize():
+            pygame.transform.scale(intermediate_screen, screen_size, screen)
+        else:
+            if self.scaled_screen is None or self.scaled_screen.get_size() != screen_size:
+                self.scaled_screen = pygame.Surface(screen_size, 0, intermediate_screen)
+            pygame.transform.scale(intermediate_screen, screen_size, self.scaled_screen)
+            screen.blit(self.scaled_screen, (0, 0))
+
+    def present_rects(self, source_screen, source_rects, source_position, screen):
+        """
+        Scales only some regions of a surface drawn in the intermediate screen.
+        :param source_screen: surface with the regions
+        :param source_rects: rects of source_screen to present
+        :param source_position: position of source_screen in the intermediate screen
+        :param screen: window surface
+        :return: the screen rects to update or None if the screen is not an integer multiple of the intermediate
+        screen, so the regions cannot be scaled without seams
+        """
+        scale = self.get_integer_scale(screen)
+        if scale is None or screen.get_bitsize() != source_screen.get_bitsize():
+            return None
+
+        update_rects = []
+        for rect in source_rects:
+            rect = rect.clip(source_screen.get_rect())
+            if rect.width == 0 or rect.height == 0:
+                continue
+            screen_rect = pygame.Rect((source_position[0] + rect.x) * scale, (source_position[1] + rect.y) * scale,
+                                      rect.width * scale, rect.height * scale)
+            pygame.transform.scale(source_screen.subsurface(rect), screen_rect.size, screen.subsurface(screen_rect))
+            update_rects.append(screen_rect)
+        return update_rects
+
+
+class PresentWorker:
+
+    def __init__(self, n_screens=2):
+        """
+        Scales and presents the frames in a worker thread while the main thread simulates the next tick. pygame
+        releases the GIL while scaling and updating the window, so both can overlap.
+        The frames are drawn in n_screens intermediate screens: the next frame is drawn in one while another one is
+        presented. Only one frame waits to be presented, so the main thread never gets more than a frame ahead.
+        """
+        self.presenter = ScreenPresenter()
+        self.free_screens = queue.Queue()
+        for _ in range(n_screens):
+            self.free_screens.put(pygame.surface.Surface((WIN_X, WIN_Y)))
+        self.frames = queue.Queue(maxsize=1)
+        # Error raised while presenting a frame. It is raised again in the main thread
+        self.error = None
+        self.thread = threading.Thread(target=self.present_frames, daemon=True)
+        self.thread.start()
+
+    def get_free_screen(self):
+        """ Waits until an intermediate screen is not being presented and returns it to draw the next frame. """
+        intermediate_screen = self.free_screens.get()
+        self.raise_error()
+        return intermediate_screen
+
+    def submit(self, intermediate_screen):
+        self.frames.put(intermediate_screen)
+
+    def wait(self):
+        """ Waits until every submitted frame has been presented. """
+        self.frames.join()
+        self.raise_error()
+
+    def raise_error(self):
+        """ Raises in the main thread the error of the worker, so the game stops with it instead of freezing. """
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def present_frames(self):
+        while True:
+            intermediate_screen = self.frames.get()
+            try:
+                with display_lock:
+                    # The window can be closed while the frame waits
+                    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                        self.presenter.present(intermediate_screen, pygame.display.get_surface())
+                        pygame.display.update()
+            except Exception as error:
+                self.error = error
+            finally:
+                # The main thread waits for the screen and the frame even if the frame could not be presented
+                self.free_screens.put(intermediate_screen)
+                self.frames.task_done()
+
+
+class DepthSortedDrawList:
+
+    def __init__(self):
+        """
+        Objects to draw sorted by the bottom of their draw hitbox, so the objects lower in the room are drawn over the
+        ones behind them. The list is kept between frames: the objects only move some pixels per tick, so the list is
+        nearly sorted and an insertion sort orders it again in almost linear time.
+        """
+        self.objects = []
+        self.object_ids = set()
+
+    def update_objects(self, *object_groups):
+        """
+        Removes the objects that are not drawn anymore and adds the new ones at the end, keeping the order of the rest.
+        :param object_groups: sequences with every object to draw
+        """
+        object_ids = {id(obj) for objects in object_groups for obj in objects}
+        if object_ids != self.object_ids:
+            self.objects = [obj for obj in self.objects if id(obj) in object_ids]
+            self.objects.extend(obj for objects in object_groups for obj in objects if id(obj) not in self.object_ids)
+            self.object_ids = object_ids
+        return self.objects
+
+    @staticmethod
+    def get_depth(obj):
+        return obj.draw_hitbox.hitbox.bottom
+
+    def sort(self):
+        """ Sorts the objects in place with a stable insertion sort and returns them. """
+        objects = self.objects
+        depths = [self.get_depth(obj) for obj in objects]
+        for index in range(1, len(objects)):
+            obj, depth = objects[index], depths[index]
+            position = index
+            while position > 0 and depths[position - 1] > depth:
+                objects[position] = objects[position - 1]
+                depths[position] = depths[position - 1]
+                position -= 1
+            objects[position] = obj
+            depths[position] = depth
+        return objects
+
+
+class RenderQueue:
+
+    def __init__(self):
+        """
+        Collects what the draw behaviours submit in a frame and draws it layer by layer: first every sprite with a
+        single Surface.blits call and then the overlays (life bars, hitboxes and any other draw).
+        """
+        self.sprites = []
+        self.overlays = []
+        # Fraction of the next tick already elapsed. With 1 the objects are drawn in their last tick position
+        self.alpha = 1.
+
+    def get_interpolation_offset(self, previous_position, position):
+        """ :return: offset from the last tick position to the position between the last two ticks given by alpha """
+        if previous_position is None or self.alpha >= 1:
+            return 0, 0
+        move_x, move_y = position[0] - previous_position[0], position[1] - previous_position[1]
+        if abs(move_x) > MAX_INTERPOLATION_DISTANCE or abs(move_y) > MAX_INTERPOLATION_DISTANCE:
+            return 0, 0
+        return round((self.alpha - 1) * move_x), round((self.alpha - 1) * move_y)
+
+    def add_blit(self, surface, dest, area=None):
+        self.sprites.append((surface, dest, area))
+
+    def add_rect(self, color, rect, width=0):
+        self.overlays.append((pygame.draw.rect, color, rect, width))
+
+    def add_draw(self, draw_behaviour):
+        """ Draws a behaviour that does not submit blits nor rects with its own draw method. """
+        self.overlays.append((draw_behaviour.draw, ))
+
+    def flush(self, screen, return_rects=False):
+        """
+        Draws and empties the queue.
+        :param screen: surface to draw in
+        :param return_rects: if True, the rects where something has been drawn are returned
+        """
+        drawn_rects = screen.blits(self.sprites, doreturn=return_rects) or []
+        for overlay in self.overlays:
+            if len(overlay) == 1:
+                rect = overlay[0](screen)
+            else:
+                draw_function, color, rect, width = overlay
+                rect = draw_function(screen, color, rect, width)
+            if return_rects and rect is not None:
+                drawn_rects.append(rect)
+        self.sprites.clear()
+        self.overlays.clear()
+        return drawn_rects
+
+
 class DungeonDrawHandler(RunDrawHandler):
-    
+
+    # Shared by every dungeon run, so there is only one worker thread
+    present_worker = None
+
     def __init__(self, dungeon_run):
         super(DungeonDrawHandler, self).__init__(dungeon_run.screen)
         self.black_screen_count = 0
@@ -31,53 +240,141 @@ class DungeonDrawHandler(RunDrawHandler):
 
         self.dungeon_screen = None
         self.intermediate_screen = None
+        self.render_targets_screen_size = None
         self.is_map_open = False
 
-    def draw_run(self, pj, enemies, objects):
-        objects_to_draw = self.set_priority_objects_order_list(pj, enemies, objects)
-        self.intermediate_screen = pygame.surface.Surface((WIN_X, WIN_Y))
-
-        self.draw_contour_dungeon_limits()
-        self.dungeon_screen = pygame.surface.Surface((DUN_WIN_X, DUN_WIN_Y))
+        # Dirty rect rendering: only the regions of the objects drawn in the last and current frames are redrawn
+        self.dirty_rect_rendering = render_constants.dirty_rect_rendering and not render_constants.pipelined_present
+        self.background = None
+        self.last_drawn_rects = []
+        self.last_frame_key = None
+        self.needs_full_redraw = True
+
+        self.presenter = ScreenPresenter()
+        self.render_queue = RenderQueue()
+        self.draw_list = DepthSortedDrawList()
+        if render_constants.pipelined_present and not HEADLESS and DungeonDrawHandler.present_worker is None:
+            DungeonDrawHandler.present_worker = PresentWorker()
+
+    def update_run(self, pj, enemies, objects):
+        """
+        Updates the drawing state that affects the game (crossing door screen, animation frames and image sizes).
+        It is called every tick, also in headless mode where draw_run is skipped.
+        """
         self.do_crossing_door(pj)
+        objects_to_draw = self.draw_list.update_objects(objects, enemies, (pj, ))
         if not pj.is_crossing_door:
-            self.draw_dungeon(objects_to_draw, self.dungeon_element)
+            for obj in objects_to_draw:
+                obj.draw.update()
+            if self.dungeon_run.projectile_system is not None:
+                self.dungeon_run.projectile_system.update_draw()
+
+    def draw_run(self, pj, enemies, objects, alpha=1.):
+        """
+        Draws the dungeon in the screen.
+        :param alpha: fraction of the next tick already elapsed, used to interpolate the positions
+        :return: the screen rects to update or None if the whole screen has to be updated. With the present worker
+        it is an empty list, because the worker updates the screen
+        """
+        objects_to_draw = self.draw_list.sort()
+        self.update_render_targets()
+        if self.present_worker is not None:
+            self.intermediate_screen = self.present_worker.get_free_screen()
+        self.render_queue.alpha = alpha
+
+        frame_key = (self.dungeon_run.current_dungeon.get_static_layer(), pj.is_crossing_door, self.screen.get_size())
+        is_same_room_frame = frame_key == self.last_frame_key and not pj.is_crossing_door
+        if self.dirty_rect_rendering and not self.needs_full_redraw and is_same_room_frame:
+            update_rects = self.draw_dirty_rects(objects_to_draw)
+            if update_rects is not None:
+                return update_rects
+        else:
+            self.draw_full_frame(pj, objects_to_draw)
+        self.last_frame_key = frame_key
+        self.needs_full_redraw = False
+
+        return self.present_full_frame()
+
+    def draw_full_frame(self, pj, objects_to_draw):
+        self.draw_contour_dungeon_limits()
+        if pj.is_crossing_door:
+            self.dungeon_screen.fill((10, 10, 10))
+            self.last_drawn_rects = []
+        else:
+            self.draw_dungeon(objects_to_draw)
+
+    def draw_dirty_rects(self, objects_to_draw):
+        """
+        Restores from the background the regions drawn in the last frame, draws the objects and scales only the
+        changed regions to the screen. It needs the screen to be an integer multiple of the intermediate screen.
+        :return: the screen rects to update or None if the whole frame has to be presented
+        """
+        for rect in self.last_drawn_rects:
+            self.dungeon_screen.blit(self.background, rect, rect)
+        drawn_rects = self.draw_room(objects_to_draw)
+        dirty_rects = self.last_drawn_rects + drawn_rects
+        self.last_drawn_rects = drawn_rects
+
+        return self.presenter.present_rects(self.dungeon_screen, dirty_rects, self.get_dungeon_position(),
+                                            self.screen)
 
-        self.intermediate_screen.blit(self.dungeon_screen, (WIN_X - DUN_WIN_X - WIN_INF_BORDER_X,
-                                                            WIN_Y - DUN_WIN_Y - WIN_INF_BORDER_Y))
-        self.screen.blit(pygame.transform.scale(self.intermediate_screen, self.screen.get_rect().size), (0, 0))
+    @staticmethod
+    def get_dungeon_position():
+        return WIN_X - DUN_WIN_X - WIN_INF_BORDER_X, WIN_Y - DUN_WIN_Y - WIN_INF_BORDER_Y
+
+    def present_full_frame(self):
+        self.intermediate_screen.blit(self.dungeon_screen, self.get_dungeon_position())
+        if self.present_worker is not None:
+            self.present_worker.submit(self.intermediate_screen)
+            return []
+        self.presenter.present(self.intermediate_screen, self.screen)
+        return None
+
+    def wait_present(self):
+        """ Waits until the present worker has presented the dungeon frames, before other runs draw in the window. """
+        if self.present_worker is not None:
+            self.present_worker.wait()
+
+    def update_render_targets(self):
+        """
+        Allocates the intermediate and dungeon surfaces once and reuses them every frame. They are only allocated
+        again when the window is resized, because set_mode can change the display format. The present worker has its
+        own intermediate screens.
+        """
+        screen_size = self.screen.get_size()
+        if self.dungeon_screen is None or screen_size != self.render_targets_screen_size:
+            if self.present_worker is None:
+                self.intermediate_screen = pygame.surface.Surface((WIN_X, WIN_Y))
+            self.dungeon_screen = pygame.surface.Surface((DUN_WIN_X, DUN_WIN_Y))
+            self.render_targets_screen_size = screen_size
 
     def draw_contour_dungeon_limits(self):
         self.intermediate_screen.fill((255, 100, 100))
 
     def do_crossing_door(self, pj):
         if pj.is_crossing_door:
-            self.dungeon_screen.fill((10, 10, 10))
             self.black_screen_count += 1
             pj.is_crossing_door = True
         else:
             if 0 < self.black_screen_count < 4:
-                self.dungeon_screen.fill((10, 10, 10))
                 self.black_screen_count += 1
                 pj.is_crossing_door = True
             else:
                 self.black_screen_count = 0
                 pj.is_crossing_door = False
 
-    def draw_dungeon(self, objects_to_draw, dungeon_element):
-        if self.dungeon_run.is_exit_room:
-            self.dungeon_screen.blit(bg_img_database[dungeon_element]['boss_bg'], (0, 0))
-            self.draw_room(objects_to_draw)
-
-        else:
-            self.dungeon_screen.blit(bg_img_database[dungeon_element]['normal_bg'], (0, 0))
-            self.draw_room(objects_to_draw)
+    def draw_dungeon(self, objects_to_draw):
+        self.background = self.dungeon_run.current_dungeon.get_static_layer()
+        self.dungeon_screen.blit(self.background, (0, 0))
+        self.last_drawn_rects = self.draw_room(objects_to_draw)
 
     def draw_room(self, objects_to_draw):
-        self.dungeon_run.current_dungeon.doors_handler.draw_doors(self.dungeon_screen)
-
+        """ Draws the objects through the render queue and returns the rects where they have been drawn. """
         for obj in objects_to_draw:
-            obj.draw.draw(self.dungeon_screen)
+            obj.draw.submit(self.render_queue)
+        if self.dungeon_run.projectile_system is not None:
+            self.dungeon_run.projectile_system.submit(self.render_queue)
+        return self.render_queue.flush(self.dungeon_screen, return_rects=self.dirty_rect_rendering)
 
 
 class Draw(ABC):
@@ -85,20 +382,52 @@ class Draw(ABC):
     def __init__(self, obj, image_database):
         self.obj = obj
         self.image_database = image_database
+        self.previous_position = None
+        self.position = None
+
+    def update(self):
+        """ Advances the drawing state that affects the game, such as the animation frame. It is called every tick. """
+        pass
+
+    def reset(self):
+        """ Restarts the drawing state when its object is reused. """
+        self.previous_position = None
+        self.position = None
+
+    def update_position(self, position):
+        """ Keeps the positions of the last two ticks to interpolate between them. """
+        self.previous_position = self.position
+        self.position = position
+
+    def get_interpolated_rect(self, rect, render_queue):
+        offset = render_queue.get_interpolation_offset(self.previous_position, self.position)
+        if offset == (0, 0):
+            return rect
+        return rect.move(offset)
 
     @abstractmethod
     def draw(self, screen):
         pass
 
+    def submit(self, render_queue):
+        """ Adds the drawing to the render queue instead of drawing it right away. """
+        render_queue.add_draw(self)
+
 
 class NoDraw(Draw):
 
     def __init__(self):
         pass
 
+    def reset(self):
+        pass
+
     def draw(self, screen):
         pass
 
+    def submit(self, render_queue):
+        pass
+
 
 class DrawRectangle(Draw):
 
@@ -107,15 +436,21 @@ class DrawRectangle(Draw):
         self.color = color
 
     def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.obj.draw_hitbox.hitbox, 1)
+        return pygame.draw.rect(screen, self.color, self.obj.draw_hitbox.hitbox, 1)
+
+    def submit(self, render_queue):
+        render_queue.add_rect(self.color, self.obj.draw_hitbox.hitbox, 1)
 
 
 class DrawImage(Draw):
 
     def draw(self, screen):
-        screen.blit(self.image_database, self.obj.draw_hitbox.hitbox)
+        return screen.blit(self.image_database, self.obj.draw_hitbox.hitbox)
         # pygame.draw.rect(screen, (0, 0, 0), self.obj.draw_hitbox.hitbox, 1)
 
+    def submit(self, render_queue):
+        render_queue.add_blit(self.image_database, self.obj.draw_hitbox.hitbox)
+
 
 class DrawEntityAnimation(Draw):
 
@@ -123,34 +458,44 @@ class DrawEntityAnimation(Draw):
         super(DrawEntityAnimation, self).__init__(obj, image_database)
         self.frames = 0
         self.last_frames = 0
+        self.sheet = None
+        self.img_area = None
+        self.rect = None
+
+    def update(self):
+        self.sheet, self.img_area, previous_img_area = self.get_the_img()
+        self.rect = self.fix_img_position_when_dimension_changes(self.img_area, previous_img_area)
+        self.update_position(self.rect.topleft)
+        self.obj.movement.move_hitboxes()
 
     def draw(self, screen):
-        img, previous_frame_img = self.get_the_img()
-        rect = self.fix_img_position_when_dimension_changes(img, previous_frame_img)
-        self.obj.movement.move_hitboxes()
-        screen.blit(img, rect)
+        return screen.blit(self.sheet, self.rect, self.img_area)
+
+    def submit(self, render_queue):
+        render_queue.add_blit(self.sheet, self.get_interpolated_rect(self.rect, render_queue), self.img_area)
 
     def get_the_img(self):
-        if self.frames >= len(self.image_database[self.obj.state][tuple(self.obj.mov_axis)]):
+        clip = self.image_database[self.obj.state][tuple(self.obj.mov_axis)]
+        previous_clip = self.image_database[self.obj.last_state][tuple(self.obj.last_mov_axis)]
+        if self.frames >= len(clip):
             self.frames = 0
-        if self.last_frames >= len(self.image_database[self.obj.last_state][tuple(self.obj.last_mov_axis)]):
+        if self.last_frames >= len(previous_clip):
             self.last_frames = 0
 
-        img = self.image_database[self.obj.state][tuple(self.obj.mov_axis)][self.frames]
-        previous_frame_img = self.image_database[self.obj.last_state][tuple(self.obj.last_mov_axis)][self.last_frames]
+        img_area = clip.get_area(self.frames)
+        previous_img_area = previous_clip.get_area(self.last_frames)
         self.last_frames = self.frames
         self.frames += 1
-        return img, previous_frame_img
+        return clip.sheet, img_area, previous_img_area
 
-    def fix_img_position_when_dimension_changes(self, img, previous_frame_img):
-        rect = img.get_rect()
+    def fix_img_position_when_dimension_changes(self, img_area, previous_img_area):
+        rect = img_area.copy()
         self.obj.width = rect.width
         self.obj.height = rect.height
-        previous_rect = previous_frame_img.get_rect()
         if not (self.obj.mov_axis != [0, -1] and self.obj.attacking):
-            self.obj.pos_y -= (rect.height - previous_rect.height)
+            self.obj.pos_y -= (rect.height - previous_img_area.height)
         if self.obj.mov_axis == [-1, 0]:
-            self.obj.pos_x -= (rect.width - previous_rect.width)
+            self.obj.pos_x -= (rect.width - previous_img_area.width)
         rect.x = self.obj.pos_x
         rect.y = self.obj.pos_y
         self.obj.last_width = self.obj.width
@@ -163,27 +508,39 @@ class DrawAnimation(Draw):
         super(DrawAnimation, self).__init__(obj, image_database)
         self.frames = 0
         self.last_frames = 0
+        self.img_area = None
+        self.rect = None
+
+    def reset(self):
+        super(DrawAnimation, self).reset()
+        self.frames = 0
+        self.last_frames = 0
+        self.img_area = None
+        self.rect = None
+
+    def update(self):
+        self.img_area = self.get_the_img()
+        self.rect = self.get_rect(self.img_area)
+        self.update_position(self.rect.topleft)
 
     def draw(self, screen):
-        img, previous_frame_img = self.get_the_img()
-        rect = self.get_rect(img)
-        self.obj.movement.move_hitboxes()
-        screen.blit(img, rect)
+        return screen.blit(self.image_database.sheet, self.rect, self.img_area)
+
+    def submit(self, render_queue):
+        render_queue.add_blit(self.image_database.sheet, self.get_interpolated_rect(self.rect, render_queue),
+                              self.img_area)
 
     def get_the_img(self):
         if self.frames >= len(self.image_database):
             self.frames = 0
-        if self.last_frames >= len(self.image_database):
-            self.last_frames = 0
 
-        img = self.image_database[self.frames]
-        previous_frame_img = self.image_database[self.last_frames]
+        img_area = self.image_database.get_area(self.frames)
         self.last_frames = self.frames
         self.frames += 1
-        return img, previous_frame_img
+        return img_area
 
-    def get_rect(self, img):
-        rect = img.get_rect()
+    def get_rect(self, img_area):
+        rect = img_area.copy()
         rect.x = self.obj.pos_x
         rect.y = self.obj.pos_y
         return rect
@@ -195,15 +552,26 @@ class DrawLifeBar(Draw):
         super(DrawLifeBar, self).__init__(obj, image_database=None)
         self.hp_width = self.obj.width
 
+    def update(self):
+        self.update_position((self.obj.pos_x, self.obj.pos_y))
+
     def draw(self, screen):
+        hp_barra_black, hp_barra = self.get_bar_rects()
+        black_rect = pygame.draw.rect(screen, (0, 0, 0), hp_barra_black, 1)
+        return black_rect.union(pygame.draw.rect(screen, (0, 200, 0), hp_barra, 1))
+
+    def submit(self, render_queue):
+        hp_barra_black, hp_barra = self.get_bar_rects()
+        render_queue.add_rect((0, 0, 0), self.get_interpolated_rect(hp_barra_black, render_queue), 1)
+        render_queue.add_rect((0, 200, 0), self.get_interpolated_rect(hp_barra, render_queue), 1)
+
+    def get_bar_rects(self):
         # TODO: change the position for the pj?
         # Barras de vida
         hp_barra = pygame.Rect(self.obj.pos_x + 1, self.obj.pos_y - 4,
                                int(self.hp_width * (self.obj.hp / self.obj.max_hp)), 1)
         hp_barra_black = pygame.Rect(self.obj.pos_x, self.obj.pos_y - 5, self.hp_width + 2, 3)
-
-        pygame.draw.rect(screen, (0, 0, 0), hp_barra_black, 1)
-        pygame.draw.rect(screen, (0, 200, 0), hp_barra, 1)
+        return hp_barra_black, hp_barra
 
 
 class DrawAnimationEntityWithLifeBar(Draw):
@@ -213,9 +581,17 @@ class DrawAnimationEntityWithLifeBar(Draw):
         self.draw_animation = DrawEntityAnimation(obj, animation_database)
         self.draw_life_bar = DrawLifeBar(obj)
 
+    def update(self):
+        self.draw_animation.update()
+        self.draw_life_bar.update()
+
     def draw(self, screen):
-        self.draw_animation.draw(screen)
-        self.draw_life_bar.draw(screen)
+        animation_rect = self.draw_animation.draw(screen)
+        return animation_rect.union(self.draw_life_bar.draw(screen))
+
+    def submit(self, render_queue):
+        self.draw_animation.submit(render_queue)
+        self.draw_life_bar.submit(render_queue)
 
 
 class DrawDecorator(Draw):
@@ -230,9 +606,15 @@ class DrawDecorator(Draw):
     def draw_behaviour(self) -> Draw:
         return self._draw_behaviour
 
+    def update(self):
+        self._draw_behaviour.update()
+
     def draw(self, screen):
         return self._draw_behaviour.draw(screen)
 
+    def submit(self, render_queue):
+        self._draw_behaviour.submit(render_queue)
+
 
 class DrawSuppEntityHitbox(DrawDecorator):
 
@@ -240,24 +622,31 @@ class DrawSuppEntityHitbox(DrawDecorator):
         super(DrawSuppEntityHitbox, self).__init__(obj, animation_database, DrawAnimationEntityWithLifeBar)
 
     def draw(self, screen):
-        self.draw_hitboxes_supp(screen)
-        self._draw_behaviour.draw(screen)
+        hitboxes_rect = self.draw_hitboxes_supp(screen)
+        return hitboxes_rect.union(self._draw_behaviour.draw(screen))
 
     def draw_hitboxes_supp(self, screen):
         # TODO: remove when finish the tests
-        pygame.draw.rect(screen, (0, 255, 0), self.obj.draw_hitbox.hitbox, 1)
-        pygame.draw.rect(screen, (255, 0, 0), self.obj.attack_hitbox.hitbox, 1)
+        draw_rect = pygame.draw.rect(screen, (0, 255, 0), self.obj.draw_hitbox.hitbox, 1)
+        return draw_rect.union(pygame.draw.rect(screen, (255, 0, 0), self.obj.attack_hitbox.hitbox, 1))
         # pygame.draw.rect(screen, (0, 0, 255), self.obj.door_hitbox.hitbox, 1)
 
+    def submit(self, render_queue):
+        render_queue.add_rect((0, 255, 0), self.obj.draw_hitbox.hitbox, 1)
+        render_queue.add_rect((255, 0, 0), self.obj.attack_hitbox.hitbox, 1)
+        self._draw_behaviour.submit(render_queue)
+
 
 class DrawTextScreen(Draw):
 
     def __init__(self, obj, image_database):
         super().__init__(obj, image_database)
-        self.font = pygame.font.Font(fonts_mapper['arial'], 25)
-    
+        self.font_path = fonts_mapper['arial']
+        self.font_size = 25
+
     def draw(self, screen):
-        label = self.font.render(self.obj.text + '. Press enter to restart the game.', 1, (255, 255, 255))
+        label = text_cache.render(self.font_path, self.font_size, self.obj.text + '. Press enter to restart the game.',
+                                  (255, 255, 255), True)
         window_x, window_y = screen_sizes[self.obj.pos_screen_size]
         screen.fill((0, 0, 0))
         screen.blit(label, (window_x / 2 - label.get_width() / 2, window_y / 2 - label.get_height() / 2))
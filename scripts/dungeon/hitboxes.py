@@ -9,6 +9,8 @@ from scripts.variables import DUN_WIN_X, DUN_WIN_Y
 
 class Hitbox(ABC):
 
+    __slots__ = ('center_x', 'center_y', 'hitbox')
+
     hitbox: Union[Circle, Rect]
     center_x: float
     center_y: float
@@ -40,6 +42,8 @@ class Hitbox(ABC):
 
 class RectangleHitbox(Hitbox):
 
+    __slots__ = ('ratio', )
+
     def __init__(self, pos_x, pos_y, width, height, ratio=1):
         super(RectangleHitbox, self).__init__(pos_x, pos_y, width, height)
         self.ratio = ratio
@@ -59,6 +63,9 @@ class RectangleHitbox(Hitbox):
 
 
 class CircleHitbox(Hitbox):
+
+    __slots__ = ()
+
     def __init__(self, pos_x, pos_y, width, height, radius):
         super(CircleHitbox, self).__init__(pos_x, pos_y, width, height)
         self.hitbox = self.create_hitbox(self.center_x, self.center_y, radius)
@@ -72,11 +79,16 @@ class CircleHitbox(Hitbox):
 
 class NoHitbox(CircleHitbox):
 
+    __slots__ = ()
+
     def __init__(self, pos_x, pos_y, width, height):
         super().__init__(pos_x, pos_y, width, height, 0)
 
 
 class AllScreenHitbox(RectangleHitbox):
+
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(0, 0, DUN_WIN_X, DUN_WIN_Y)
 
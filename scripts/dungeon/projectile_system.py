@@ -0,0 +1,175 @@
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from scripts.draw import NoDraw
+from scripts.entity.entity import Pj
+from scripts.variables import n_pjs, projectile_img_database, DUN_WIN_X, DUN_WIN_Y
+
+
+def create_projectile_system(vectorized_projectiles):
+    """
+    Returns a ProjectileSystem if the vectorized projectiles are enabled and NumPy is installed. Otherwise, None is
+    returned and every projectile is a Projectile object.
+    """
+    if not vectorized_projectiles:
+        return None
+    if np is None:
+        warnings.warn('NumPy is not installed, so the projectiles are not vectorized')
+        return None
+    return ProjectileSystem()
+
+
+class ProjectileSystem:
+
+    def __init__(self, capacity=256):
+        """
+        Keeps the projectiles as arrays (structure of arrays) and advances all of them at once with NumPy: movement,
+        lifetime, room limits and collisions with the entities. The Projectile objects made by the attacks are only
+        read when they are added.
+        :param capacity: number of projectiles that fit in the arrays before they are enlarged
+        """
+        self.n_projectiles = 0
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.sizes = np.zeros((capacity, 2), dtype=np.int64)
+        self.lifetimes = np.zeros(capacity, dtype=np.int64)
+        self.damages = np.zeros(capacity, dtype=np.int64)
+        self.is_pj_team = np.zeros(capacity, dtype=bool)
+        # Index in element_clips or -1 if the projectile is not drawn
+        self.elements = np.zeros(capacity, dtype=np.int64)
+        # Animation tick. It is -1 until the projectile is updated for the first time
+        self.frames = np.zeros(capacity, dtype=np.int64)
+
+        self.element_index = {}
+        self.element_clips = []
+
+    @property
+    def arrays(self):
+        return (self.positions, self.velocities, self.sizes, self.lifetimes, self.damages, self.is_pj_team,
+                self.elements, self.frames)
+
+    def __len__(self):
+        return self.n_projectiles
+
+    def add(self, projectile):
+        """ Adds a projectile made by an attack. It moves the same as the BaseMovement of the projectile. """
+        if self.n_projectiles == len(self.positions):
+            self.enlarge()
+        index = self.n_projectiles
+
+        axis = projectile.axis
+        vel_mod = (axis[0] ** 2 + axis[1] ** 2) ** (1 / 2) if axis[0] != 0 and axis[1] != 0 else 1
+        self.positions[index] = projectile.pos_x, projectile.pos_y
+        self.velocities[index] = projectile.vel * axis[0] / vel_mod, projectile.vel * axis[1] / vel_mod
+        self.sizes[index] = int(projectile.width), int(projectile.height)
+        self.lifetimes[index] = projectile.lifetime
+        self.damages[index] = projectile.damage
+        self.is_pj_team[index] = isinstance(projectile.owner, Pj)
+        self.elements[index] = -1 if isinstance(projectile.draw, NoDraw) else self.get_element_index(projectile.element)
+        self.frames[index] = -1
+        self.n_projectiles += 1
+
+    def get_element_index(self, element):
+        if element not in self.element_index:
+            self.element_index[element] = len(self.element_clips)
+            self.element_clips.append(projectile_img_database[element])
+        return self.element_index[element]
+
+    def enlarge(self):
+        capacity = 2 * len(self.positions)
+        (self.positions, self.velocities, self.sizes, self.lifetimes, self.damages, self.is_pj_team, self.elements,
+         self.frames) = [np.resize(array, (capacity, ) + array.shape[1:]) for array in self.arrays]
+
+    def clear(self):
+        self.n_projectiles = 0
+
+    def step(self, entities):
+        """
+        Runs the turn of every projectile: it moves, loses a tick of lifetime and is removed when it leaves the room,
+        hits an entity or its lifetime ends.
+        :param entities: list with the pjs first and then the enemies
+        """
+        n_projectiles = self.n_projectiles
+        if n_projectiles == 0:
+            return
+        positions = self.positions[:n_projectiles]
+        positions += self.velocities[:n_projectiles]
+        self.lifetimes[:n_projectiles] -= 1
+
+        outside = ((positions[:, 0] < 0) | (positions[:, 0] > DUN_WIN_X)
+                   | (positions[:, 1] < 0) | (positions[:, 1] > DUN_WIN_Y))
+        hit_entities = self.get_hit_entities(entities, ~outside)
+        is_hit = hit_entities >= 0
+        for projectile_index in np.flatnonzero(is_hit).tolist():
+            entities[hit_entities[projectile_index]].hp -= int(self.damages[projectile_index])
+
+        self.remove(outside | is_hit | (self.lifetimes[:n_projectiles] <= 0))
+
+    def get_hit_entities(self, entities, can_hit):
+        """
+        Tests in batch the attack hitbox of the projectiles against the defense hitbox of the entities of the other
+        team. Each projectile hits the nearest entity that collides with it, as Projectile.check_entity_collision.
+        :param entities: list with the pjs first and then the enemies
+        :param can_hit: mask of the projectiles that can hit an entity
+        :return: index of the entity hit by each projectile or -1
+        """
+        n_projectiles = self.n_projectiles
+        hit_entities = np.full(n_projectiles, -1)
+        if not entities:
+            return hit_entities
+
+        # The hitboxes are pygame Rects, which truncate the positions
+        left_top = np.trunc(self.positions[:n_projectiles])
+        right_bottom = left_top + self.sizes[:n_projectiles]
+        projectile_min = np.minimum(left_top, right_bottom)[:, None, :]
+        projectile_max = np.maximum(left_top, right_bottom)[:, None, :]
+        projectile_not_empty = np.all(self.sizes[:n_projectiles] != 0, axis=1)
+
+        entity_rects = np.array([tuple(entity.defense_hitbox.hitbox) for entity in entities], dtype=np.int64)
+        entity_left_top = entity_rects[:, :2]
+        entity_right_bottom = entity_left_top + entity_rects[:, 2:]
+        entity_min = np.minimum(entity_left_top, entity_right_bottom)[None, :, :]
+        entity_max = np.maximum(entity_left_top, entity_right_bottom)[None, :, :]
+        entity_not_empty = np.all(entity_rects[:, 2:] != 0, axis=1)
+        entity_is_pj = np.arange(len(entities)) < n_pjs
+
+        collide = (np.all((projectile_min < entity_max) & (projectile_max > entity_min), axis=2)
+                   & (self.is_pj_team[:n_projectiles, None] != entity_is_pj[None, :])
+                   & (can_hit & projectile_not_empty)[:, None] & entity_not_empty[None, :])
+
+        entity_positions = np.array([(entity.pos_x, entity.pos_y) for entity in entities], dtype=float)
+        distances = np.sum((self.positions[:n_projectiles, None, :] - entity_positions[None, :, :]) ** 2, axis=2)
+        distances[~collide] = np.inf
+        # argmin returns the first entity when there is a tie, as the stable sort of the entities by distance
+        nearest_entities = np.argmin(distances, axis=1)
+        is_hit = collide[np.arange(n_projectiles), nearest_entities]
+        hit_entities[is_hit] = nearest_entities[is_hit]
+        return hit_entities
+
+    def remove(self, removed):
+        """ Removes the projectiles of the mask, keeping the order of the rest. """
+        kept = ~removed
+        n_kept = int(np.count_nonzero(kept))
+        if n_kept == self.n_projectiles:
+            return
+        for array in self.arrays:
+            array[:n_kept] = array[:self.n_projectiles][kept]
+        self.n_projectiles = n_kept
+
+    def update_draw(self):
+        """ Advances the animation of every projectile. It is called every tick, as Draw.update. """
+        self.frames[:self.n_projectiles] += 1
+
+    def submit(self, render_queue):
+        """ Adds the blits of the drawn projectiles to the render queue. """
+        n_projectiles = self.n_projectiles
+        drawn = np.flatnonzero((self.elements[:n_projectiles] >= 0) & (self.frames[:n_projectiles] >= 0))
+        destinations = np.trunc(self.positions[drawn]).astype(np.int64).tolist()
+        for projectile_index, destination in zip(drawn.tolist(), destinations):
+            clip = self.element_clips[self.elements[projectile_index]]
+            area = clip.get_area(int(self.frames[projectile_index]) % len(clip))
+            render_queue.add_blit(clip.sheet, destination, area)
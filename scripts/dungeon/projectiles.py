@@ -1,39 +1,73 @@
 from scripts.draw import DrawAnimation, NoDraw
 from scripts.entity.movement import Movement, BaseMovement
 from scripts.objects import Object
-from scripts.utils import collision_between_two_objects, argsort
+from scripts.utils import collision_between_two_objects
 from scripts.variables import n_pjs, projectiles_constants, projectile_img_database, DUN_WIN_Y, DUN_WIN_X
 
+MELEE_POOL_KEY = 'melee'
+
 
 class Projectile(Object):
+
+    __slots__ = ('movement', 'attack_hitbox', 'damage', 'lifetime', 'owner', 'element', 'vel', 'mov_axis',
+                 'last_mov_axis', 'drawable')
+
+    # The attack hitbox is the draw hitbox
+    hitbox_names = ('draw_hitbox', 'attack_hitbox')
+
     def __init__(self, axis, damage: int, owner, element: str = None, lifetime: int = None,
                  movement: Movement = None, width=None, height=None, vel=None, drawable=True):
-        self.width = width if width is not None else projectiles_constants[element]['width']
-        self.height = height if height is not None else projectiles_constants[element]['height']
+        self.width = width if width is not None else projectiles_constants[element].width
+        self.height = height if height is not None else projectiles_constants[element].height
 
         pos_x, pos_y = owner.initialize_projectile(self.width, self.height)
 
         super().__init__(pos_x, pos_y, self.width, self.height, axis)
-        self.damage = damage if damage is not None else projectiles_constants[element]['damage']
         self.movement = movement if movement is not None else BaseMovement(self)
-        self.lifetime = lifetime if lifetime is not None else projectiles_constants[element]['lifetime']
-        self.owner = owner
         self.attack_hitbox = self.draw_hitbox
+        self.set_attack_attributes(damage, owner, element, lifetime, vel)
 
-        self.vel = vel if vel is not None else projectiles_constants[element]['vel']
-        self.mov_axis = self.axis
-
+        self.drawable = drawable
         if not drawable:
             self.draw = NoDraw()
         else:
             self.draw = DrawAnimation(self, image_database=projectile_img_database[element])
 
-    def turn(self, all_entities):
+    def set_attack_attributes(self, damage, owner, element, lifetime, vel):
+        self.damage = damage if damage is not None else projectiles_constants[element].damage
+        self.lifetime = lifetime if lifetime is not None else projectiles_constants[element].lifetime
+        self.owner = owner
+        self.element = element
+        self.vel = vel if vel is not None else projectiles_constants[element].vel
+        self.mov_axis = self.axis
+
+    def reset(self, axis, damage: int, owner, element: str = None, lifetime: int = None,
+              movement: Movement = None, width=None, height=None, vel=None):
+        """
+        Reinitialises in place a released projectile as a new one made with the same arguments. Its hitbox, movement
+        and draw are reused, so it must have been made with the same element and drawable.
+        """
+        self.width = width if width is not None else projectiles_constants[element].width
+        self.height = height if height is not None else projectiles_constants[element].height
+        self.pos_x, self.pos_y = owner.initialize_projectile(self.width, self.height)
+        self.axis = axis
+        self.frames = 0
+
+        if movement is not None:
+            self.movement = movement
+        elif type(self.movement) is not BaseMovement:
+            self.movement = BaseMovement(self)
+        self.movement.move_hitboxes()
+        self.set_attack_attributes(damage, owner, element, lifetime, vel)
+        self.draw.reset()
+
+    def turn(self, entities_hash):
+        """ :param entities_hash: SpatialHash with every entity of the room """
         self.movement.move(self)
         self.lifetime -= 1
         if self.check_projectile_outside_screen():
             return True
-        elif self.check_entity_collision(all_entities):
+        elif self.check_entity_collision(entities_hash):
             return True
         elif self.lifetime <= 0:
             return True
@@ -45,17 +79,53 @@ class Projectile(Object):
             return True
         return False
 
-    def check_entity_collision(self, all_entities):
+    def check_entity_collision(self, entities_hash):
+        """
+        Damages the nearest entity of the other side that collides with the projectile. Only the entities in the
+        spatial hash cells of the projectile are checked.
+        """
         from scripts.entity.entity import Pj
-        potential_damaged_entities = all_entities[n_pjs:] if isinstance(self.owner, Pj) else all_entities[:n_pjs]
-
-        distance_to_entities = [((self.pos_x - entity.pos_x)**2 + (self.pos_y - entity.pos_y)**2)**(1/2)
-                                for entity in potential_damaged_entities]
+        is_pj_projectile = isinstance(self.owner, Pj)
+        all_entities = entities_hash.entities
+        potential_damaged_entities = [all_entities[index] for index in entities_hash.query(self.attack_hitbox.hitbox)
+                                      if (index >= n_pjs) == is_pj_projectile]
 
-        entities_index = argsort(distance_to_entities)
-        potential_damaged_entities = [potential_damaged_entities[i] for i in entities_index]
+        potential_damaged_entities.sort(key=lambda entity: (self.pos_x - entity.pos_x)**2
+                                        + (self.pos_y - entity.pos_y)**2)
         for entity in potential_damaged_entities:
             if collision_between_two_objects(entity.defense_hitbox.hitbox, self.attack_hitbox.hitbox):
                 entity.hp -= self.damage
                 return True
         return False
+
+
+class ProjectilePool:
+
+    def __init__(self):
+        """
+        Keeps the released projectiles of each kind (an element or melee) and reinitialises them in place in the next
+        attacks, instead of making a new projectile with its hitbox, movement and draw in every attack.
+        """
+        self.released_projectiles = {}
+
+    @staticmethod
+    def get_pool_key(element, drawable):
+        return element if drawable else MELEE_POOL_KEY
+
+    def acquire(self, axis, damage: int, owner, element: str = None, lifetime: int = None,
+                movement: Movement = None, width=None, height=None, vel=None, drawable=True) -> Projectile:
+        """ Returns a projectile as Projectile(...) with the same arguments, reusing a released one if possible. """
+        released_projectiles = self.released_projectiles.get(self.get_pool_key(element, drawable))
+        if released_projectiles:
+            projectile = released_projectiles.pop()
+            projectile.reset(axis, damage, owner, element, lifetime, movement, width, height, vel)
+            return projectile
+        return Projectile(axis, damage, owner, element, lifetime, movement, width, height, vel, drawable)
+
+    def release(self, projectile):
+        """ Keeps a projectile that is not used anymore, after its turn has reported that it is finished. """
+        self.released_projectiles.setdefault(self.get_pool_key(projectile.element, projectile.drawable),
+                                             []).append(projectile)
+
+
+projectile_pool = ProjectilePool()
@@ -0,0 +1,69 @@
+from typing import Union
+
+from pygame import Rect
+
+from scripts.geometric_forms import Circle
+from scripts.variables import DUN_WIN_X, DUN_WIN_Y
+
+SPATIAL_HASH_CELL_SIZE = 32
+
+
+def get_bounding_box(hitbox: Union[Circle, Rect]):
+    """ Returns the left, top, right and bottom of the hitbox. """
+    if isinstance(hitbox, Circle):
+        return (hitbox.center_x - hitbox.radius, hitbox.center_y - hitbox.radius,
+                hitbox.center_x + hitbox.radius, hitbox.center_y + hitbox.radius)
+    return hitbox.left, hitbox.top, hitbox.right, hitbox.bottom
+
+
+class SpatialHash:
+
+    def __init__(self, width=DUN_WIN_X, height=DUN_WIN_Y, cell_size=SPATIAL_HASH_CELL_SIZE):
+        """
+        Uniform grid over the room that keeps in each cell the entities whose defense hitbox overlaps it, so a
+        projectile only checks the collision with the entities of its cells. It is rebuilt once per tick.
+        The hitboxes out of the room are kept in the border cells.
+        :param width: room width
+        :param height: room height
+        :param cell_size: side of the square cells
+        """
+        self.cell_size = cell_size
+        self.n_columns = -(-width // cell_size)
+        self.n_rows = -(-height // cell_size)
+        self.cells = [[] for _ in range(self.n_columns * self.n_rows)]
+        self.used_cells = []
+        self.entities = []
+
+    def get_cell_ranges(self, hitbox):
+        """ Returns the ranges of rows and columns of the cells that the hitbox overlaps. """
+        left, top, right, bottom = get_bounding_box(hitbox)
+        first_column = min(max(int(left // self.cell_size), 0), self.n_columns - 1)
+        last_column = min(max(int(right // self.cell_size), 0), self.n_columns - 1)
+        first_row = min(max(int(top // self.cell_size), 0), self.n_rows - 1)
+        last_row = min(max(int(bottom // self.cell_size), 0), self.n_rows - 1)
+        return range(first_row, last_row + 1), range(first_column, last_column + 1)
+
+    def rebuild(self, entities):
+        """ :param entities: list of entities. The cells keep their indexes in the list """
+        for cell_index in self.used_cells:
+            self.cells[cell_index].clear()
+        self.used_cells.clear()
+
+        self.entities = entities
+        for entity_index, entity in enumerate(entities):
+            rows, columns = self.get_cell_ranges(entity.defense_hitbox.hitbox)
+            for row in rows:
+                for column in columns:
+                    cell_index = row * self.n_columns + column
+                    if not self.cells[cell_index]:
+                        self.used_cells.append(cell_index)
+                    self.cells[cell_index].append(entity_index)
+
+    def query(self, hitbox):
+        """ Returns the sorted indexes of the entities that share a cell with the hitbox. """
+        entity_indexes = set()
+        rows, columns = self.get_cell_ranges(hitbox)
+        for row in rows:
+            for column in columns:
+                entity_indexes.update(self.cells[row * self.n_columns + column])
+        return sorted(entity_indexes)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 
-from scripts.dungeon.projectiles import Projectile
+from scripts.dungeon.projectiles import projectile_pool
 from scripts.utils import collision_between_two_objects
 
 
@@ -23,15 +23,16 @@ class Attack(ABC):
 class MeleeAttack(Attack):
 
     def make_attack(self, attacker, defender, damage):
-        projectile = Projectile(axis=[0, 0], damage=damage, owner=attacker, lifetime=1, width=attacker.width,
-                                height=attacker.height, vel=0, drawable=False)
+        projectile = projectile_pool.acquire(axis=[0, 0], damage=damage, owner=attacker, lifetime=1,
+                                             width=attacker.width, height=attacker.height, vel=0, drawable=False)
         return projectile
 
 
 class MovAxisDistanceAttack(Attack):
 
     def make_attack(self, attacker, defender, damage):
-        projectile = Projectile(axis=attacker.mov_axis, damage=damage, owner=attacker, element=attacker.element)
+        projectile = projectile_pool.acquire(axis=attacker.mov_axis, damage=damage, owner=attacker,
+                                             element=attacker.element)
         return projectile
 
 
@@ -43,7 +44,8 @@ class ToTheTargetAxisDistanceAttack(Attack):
 
         module_proj_axis = (proj_x_axis**2 + proj_y_axis**2)**(1 / 2)
         norm_proj_axis = [proj_x_axis / module_proj_axis, proj_y_axis / module_proj_axis]
-        projectile = Projectile(axis=norm_proj_axis, damage=damage, owner=attacker, element=attacker.element)
+        projectile = projectile_pool.acquire(axis=norm_proj_axis, damage=damage, owner=attacker,
+                                             element=attacker.element)
         return projectile
 
 
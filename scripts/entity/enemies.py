@@ -7,9 +7,12 @@ from scripts.variables import enemy_constants, enemy_animation_database
 
 
 class Enemy(Entity, ABC):
+
+    __slots__ = ('_name', 'cooldown')
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, animation_database=enemy_animation_database[self.name],
-                         **kwargs, **enemy_constants[self.name])
+                         **kwargs, **enemy_constants[self.name].as_kwargs())
         self.moving = True
         self.attacking = True
 
@@ -25,6 +28,8 @@ class Enemy(Entity, ABC):
 
 class Moco(Enemy):
 
+    __slots__ = ('element', )
+
     def __init__(self, element, *args, **kwargs):
         self._name = "moco"
         super().__init__(*args, **kwargs)
@@ -34,7 +39,7 @@ class Moco(Enemy):
         self.attack = AttackWhenVision(ToTheTargetAxisDistanceAttack())
         self.max_attack_cooldown += 20
         self.vision_hitbox = CircleHitbox(self.pos_x, self.pos_y, self.width, self.height,
-                                          enemy_constants[self.name]['vision'])
+                                          enemy_constants[self.name].vision)
 
     @property
     def name(self):
@@ -52,6 +57,8 @@ class Moco(Enemy):
 
 class Tostada(Enemy):
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         self._name = 'tostada'
         super().__init__(*args, **kwargs)
@@ -74,6 +81,8 @@ class Tostada(Enemy):
 
 class Boca(Enemy):
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         self._name = 'boca'
         super().__init__(*args, **kwargs)
@@ -96,6 +105,8 @@ class Boca(Enemy):
 
 class Conejo(Enemy):
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         self._name = 'conejo'
         super().__init__(*args, **kwargs)
@@ -118,6 +129,8 @@ class Conejo(Enemy):
 
 class Boss(Enemy):
 
+    __slots__ = ('element', )
+
     def __init__(self, element, *args, **kwargs):
         self._name = "boss"
         super().__init__(*args, **kwargs)
@@ -127,7 +140,7 @@ class Boss(Enemy):
         self.attack = AttackWhenVision(ToTheTargetAxisDistanceAttack())
         self.max_attack_cooldown += 20
         self.vision_hitbox = CircleHitbox(self.pos_x, self.pos_y, self.width, self.height,
-                                          enemy_constants[self.name]['vision'])
+                                          enemy_constants[self.name].vision)
 
     @property
     def name(self):
@@ -8,11 +8,20 @@ from scripts.dungeon.hitboxes import RectangleHitbox
 
 class Entity(ABC):
 
+    # Slotted, as there are many entities and their attributes are read every tick. last_width is set by the draw
+    __slots__ = ('pos_x', 'pos_y', 'width', 'height', 'last_width', 'vel', 'damage', 'hp', 'max_hp', 'draw',
+                 'first_attack', 'state', 'attacking', 'moving', 'max_attack_cooldown', 'attack_cooldown', 'axis',
+                 'mov_axis', 'action_var', 'last_state', 'last_axis', 'last_mov_axis', 'animation_database',
+                 'draw_hitbox', 'attack_hitbox', 'defense_hitbox', 'vision_hitbox', 'attack', 'movement')
+
     inferior_x_limit = None
     superior_x_limit = None
     inferior_y_limit = None
     superior_y_limit = None
 
+    # Hitboxes moved with the entity by its movement
+    hitbox_names = ('draw_hitbox', 'attack_hitbox', 'defense_hitbox', 'vision_hitbox')
+
     attack: Attack
     movement: Movement
     draw: Draw
@@ -111,6 +120,10 @@ class Entity(ABC):
 
 class Pj(Entity):
 
+    __slots__ = ('sword', 'element', 'door_hitbox', 'crossing_door_count', 'is_crossing_door')
+
+    hitbox_names = Entity.hitbox_names + ('door_hitbox', )
+
     def __init__(self, pos_x, pos_y, width, height, vel, animation_database, damage, hp, sword, **kwargs):
         super(Pj, self).__init__(pos_x, pos_y, width, height, vel, animation_database, damage, hp)
         self.sword = sword
@@ -9,6 +9,10 @@ class Movement(ABC):
 
     def __init__(self, entity):
         self.entity = entity
+        self.rectangle_hitboxes = None
+        self.circle_hitboxes = None
+        # Position and size of the entity when its hitboxes were moved
+        self.hitboxes_placement = None
 
     def move(self, all_entities):
         from scripts.entity.entity import Entity
@@ -22,17 +26,43 @@ class Movement(ABC):
     def _move_entity(self, **kwargs):
         pass
 
+    def get_hitboxes(self):
+        """
+        Returns the rectangle and the circle hitboxes declared in the hitbox_names of the entity. The None hitboxes are
+        skipped and a hitbox declared with several names is only kept once.
+        """
+        rectangle_hitboxes = []
+        circle_hitboxes = []
+        for hitbox_name in self.entity.hitbox_names:
+            hitbox = getattr(self.entity, hitbox_name)
+            assert isinstance(hitbox, Hitbox) or hitbox is None, 'the hitbox names must be None or a Hitbox object'
+            if hitbox is None or any(hitbox is other for other in rectangle_hitboxes + circle_hitboxes):
+                continue
+            if isinstance(hitbox, RectangleHitbox):
+                rectangle_hitboxes.append(hitbox)
+            elif isinstance(hitbox, CircleHitbox):
+                circle_hitboxes.append(hitbox)
+        return tuple(rectangle_hitboxes), tuple(circle_hitboxes)
+
     def move_hitboxes(self):
-        hitbox_center = (self.entity.pos_x + self.entity.width / 2, self.entity.pos_y + self.entity.height / 2)
+        """
+        Moves the hitboxes to the entity position and size. The hitboxes are read the first time they are moved. Nothing
+        is done when the position and size have not changed since the last move, so the draw update, which fixes the
+        position to the image size, only moves them again when the image changes its size.
+        """
+        hitboxes_placement = (self.entity.pos_x, self.entity.pos_y, self.entity.width, self.entity.height)
+        if hitboxes_placement == self.hitboxes_placement:
+            return
+        self.hitboxes_placement = hitboxes_placement
+        if self.rectangle_hitboxes is None:
+            self.rectangle_hitboxes, self.circle_hitboxes = self.get_hitboxes()
 
-        for attribute_name, attribute_value in self.entity.__dict__.items():
-            if 'hitbox' in attribute_name:
-                assert_hitbox = 'if the attribute name contains hitbox, it must be None or a Hitbox object'
-                assert isinstance(attribute_value, Hitbox) or attribute_value is None, assert_hitbox
-                if attribute_value is not None and isinstance(attribute_value, RectangleHitbox):
-                    attribute_value.move(hitbox_center, [self.entity.width, self.entity.height])
-                elif attribute_value is not None and isinstance(attribute_value, CircleHitbox):
-                    attribute_value.move(hitbox_center, None)
+        hitbox_center = (self.entity.pos_x + self.entity.width / 2, self.entity.pos_y + self.entity.height / 2)
+        hitbox_measures = [self.entity.width, self.entity.height]
+        for hitbox in self.rectangle_hitboxes:
+            hitbox.move(hitbox_center, hitbox_measures)
+        for hitbox in self.circle_hitboxes:
+            hitbox.move(hitbox_center, None)
 
     def check_entity_collisions(self, all_entities):
         rest_of_entities = [entity for entity in all_entities if entity is not self.entity]
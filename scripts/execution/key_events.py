@@ -5,7 +5,7 @@ from typing import Optional
 import pygame
 
 from scripts import utils
-from scripts.variables import screen_sizes, general_path
+from scripts.variables import screen_sizes, general_path, set_screen_mode, display_lock
 
 
 class KeyboardEvents(ABC):
@@ -13,7 +13,8 @@ class KeyboardEvents(ABC):
     def __init__(self):
         self.keys_kept_pressed = None
         self.get_iter_keys()
-        self.events = pygame.event.get()
+        with display_lock:
+            self.events = pygame.event.get()
 
     def get_iter_keys(self):
         self.keys_kept_pressed = pygame.key.get_pressed()
@@ -33,16 +34,20 @@ class KeyboardEvents(ABC):
 
         run_output = None
 
-        for event in pygame.event.get():
+        # The events are not pumped while the present worker updates the window
+        with display_lock:
+            events = pygame.event.get()
+        for event in events:
 
             if event.type == pygame.QUIT:
                 self.save_run_parameters()
-                pygame.quit()
+                with display_lock:
+                    pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 run_output = self.keydown_events(event)
             elif event.type == pygame.VIDEORESIZE:
-                Run.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                Run.screen = set_screen_mode((event.w, event.h))
 
         return run_output
 
@@ -50,6 +55,10 @@ class KeyboardEvents(ABC):
     def pressed_keys(self):
         pass
 
+    def tick_keys(self):
+        """ Applies again the held keys that act every tick, for the extra ticks of a fixed timestep frame. """
+        pass
+
     @abstractmethod
     def keydown_events(self, event):
         pass
@@ -69,6 +78,9 @@ class DungeonKeyboardEvents(KeyboardEvents):
         self.key_volume()
         self.keys_pj_movement()
 
+    def tick_keys(self):
+        self.keys_pj_movement()
+
     def key_volume(self):
         if self.keys_kept_pressed[pygame.K_v]:
             self.dung_run.music_vol += 0.1
@@ -100,11 +112,9 @@ class DungeonKeyboardEvents(KeyboardEvents):
             self.dung_run.pos_screen_size += 1
             if self.dung_run.pos_screen_size >= len(screen_sizes):
                 self.dung_run.pos_screen_size = 0
-            self.dung_run.screen = pygame.display.set_mode(screen_sizes[self.dung_run.pos_screen_size],
-                                                           pygame.RESIZABLE)
+            self.dung_run.screen = set_screen_mode(screen_sizes[self.dung_run.pos_screen_size])
         elif event.key == pygame.K_m:
-            from scripts.execution.run import MapRun
-            return self.dung_run.make_run_output(False, MapRun(self.dung_run))
+            return self.dung_run.make_run_output(False, self.dung_run.open_map())
             # open_map = not open_map
         elif event.key == pygame.K_i:
             # return InventoryMenuRun
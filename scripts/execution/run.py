@@ -7,12 +7,19 @@ from typing import Optional
 import pygame
 
 from scripts.draw import DrawTextScreen, DungeonDrawHandler
+from scripts.dungeon.projectile_system import create_projectile_system
+from scripts.dungeon.projectiles import projectile_pool
+from scripts.dungeon.spatial_hash import SpatialHash
 from scripts.entity.entity import Pj
 from scripts.execution.key_events import DungeonKeyboardEvents, EndKeyboardEvents, MapKeyboardEvents
+from scripts.execution.timestep import FixedTimestepScheduler
 from scripts.map import Map
 from scripts.objects import Sword
+from scripts.utils import LiveList
+import scripts.variables as variables
 from scripts.variables import (WIN_X, WIN_Y, screen_sizes, dyn_params, pos_screen_size, DUN_WIN_X, DUN_WIN_Y,
-                               pj_animation_database, pj_constants, FPS, WIN_INF_BORDER_X, WIN_INF_BORDER_Y)
+                               pj_constants, FPS, WIN_INF_BORDER_X, WIN_INF_BORDER_Y,
+                               start_music, set_screen_mode, HEADLESS, render_constants, simulation_constants)
 
 
 class RunHandler:
@@ -34,6 +41,7 @@ class RunHandler:
 
 class MainRun:
     def __init__(self):
+        start_music()
         self.handler = RunHandler()
         self.handler.queue_run(DungeonRun(dungeon_element='tutorial'))
         self.stop = False
@@ -53,7 +61,7 @@ class MainRun:
 class Run(ABC):
 
     pos_screen_size = pos_screen_size
-    screen = pygame.display.set_mode(screen_sizes[pos_screen_size], pygame.RESIZABLE)
+    screen = set_screen_mode(screen_sizes[pos_screen_size])
     music_vol = dyn_params['music']['music_vol']
     clock = pygame.time.Clock()
     keyboard_handler = None
@@ -83,8 +91,8 @@ class DungeonRun(Run):
     def __init__(self, dungeon_element: str):
         # Probé a no hacer el copy y ponerlo directamente y petaba no sé por qué.
         # Probar a quitarlo cuando se acabe el refactor
-        self.fake_screen = pygame.display.set_mode((WIN_X, WIN_Y), pygame.RESIZABLE).copy()
-        Run.screen = pygame.display.set_mode(screen_sizes[self.pos_screen_size], pygame.RESIZABLE)
+        self.fake_screen = set_screen_mode((WIN_X, WIN_Y)).copy()
+        Run.screen = set_screen_mode(screen_sizes[self.pos_screen_size])
 
         self.pj = self.init_pj()
 
@@ -96,25 +104,77 @@ class DungeonRun(Run):
         self.projectiles = None
         self.objects = None
         self.entities = None
+        self.entities_hash = SpatialHash()
+        self.projectile_system = create_projectile_system(simulation_constants.vectorized_projectiles)
         self.update_dungeon_attributes()
         self.is_exit_room = False
 
         self.black_screen_count = 0
         self.keyboard_handler = DungeonKeyboardEvents(self)
         self.draw_handler = DungeonDrawHandler(self)
+        self.map_run = None
+        self.scheduler = FixedTimestepScheduler(FPS)
+
+    def run_iteration(self) -> dict:
+        if render_constants.fixed_timestep:
+            run_output = self.fixed_timestep_iteration()
+        else:
+            run_output = super(DungeonRun, self).run_iteration()
+
+        if run_output is not None:
+            # The next run draws in the window, so the dungeon frames have to be presented before
+            self.draw_handler.wait_present()
+        return run_output
+
+    def fixed_timestep_iteration(self):
+        """
+        With fixed timestep, the frame is rendered up to max_render_fps and the game logic runs the ticks that fit in
+        the elapsed time. The keyboard is read once per frame and the held keys are applied again in every extra tick.
+        """
+        elapsed_ms = self.clock.tick(render_constants.max_render_fps)
+        run_output = self.keyboard_handler.key_map()
+
+        for tick in range(self.scheduler.advance(elapsed_ms)):
+            if tick > 0:
+                self.keyboard_handler.tick_keys()
+            tick_run_output = self.simulate_tick()
+            if tick_run_output:
+                return tick_run_output
+
+        alpha = self.scheduler.alpha if render_constants.interpolation else 1.
+        self.render(alpha)
+        return run_output
+
+    def open_map(self):
+        if self.map_run is None:
+            self.map_run = MapRun(self)
+        return self.map_run.open()
 
     @staticmethod
     def init_pj():
         sword_runes_names = dyn_params['sword']['runes_names']
         slots = dyn_params['sword']['slots']
         sword = Sword(sword_runes_names, slots)
-        pj = Pj(pos_x=DUN_WIN_X - 100, pos_y=DUN_WIN_Y - 100, sword=sword, animation_database=pj_animation_database,
-                **pj_constants)
+        # Through the module, so the pj images are loaded the first time a pj is made instead of when run is imported
+        pj = Pj(pos_x=DUN_WIN_X - 100, pos_y=DUN_WIN_Y - 100, sword=sword,
+                animation_database=variables.pj_animation_database, **pj_constants.as_kwargs())
         return pj
 
     def update_dungeon_attributes(self):
-        self.projectiles = []
+        for projectile in self.projectiles or []:
+            projectile_pool.release(projectile)
+        self.projectiles = LiveList()
         self.objects = self.projectiles
+        if self.projectile_system is not None:
+            self.projectile_system.clear()
+
+    def add_projectile(self, projectile):
+        if self.projectile_system is not None:
+            # The system copies the projectile, so it can be reused right away
+            self.projectile_system.add(projectile)
+            projectile_pool.release(projectile)
+        else:
+            self.projectiles.append(projectile)
 
     def init_map(self):
         level_map = Map(dyn_params['dungeon'], self.dungeon_element)
@@ -122,6 +182,13 @@ class DungeonRun(Run):
         return level_map
 
     def specific_run_iteration(self):
+        run_output = self.simulate_tick()
+        if run_output:
+            return run_output
+        self.render()
+
+    def simulate_tick(self):
+        """ Runs one tick of the game logic. """
         self.pj.is_crossing_door = False
         pj_dead = self.alive_check()
 
@@ -130,23 +197,43 @@ class DungeonRun(Run):
 
         self.entities = [self.pj] + self.current_dungeon.enemies
 
-        for projectile in self.projectiles:
-            is_deleted = projectile.turn(self.entities)
-            if is_deleted:
-                self.projectiles.remove(projectile)
+        if self.projectile_system is not None:
+            self.projectile_system.step(self.entities)
+        else:
+            # The hash is only read by the projectiles
+            if self.projectiles:
+                self.entities_hash.rebuild(self.entities)
+            for index, projectile in self.projectiles.snapshot():
+                is_deleted = projectile.turn(self.entities_hash)
+                if is_deleted:
+                    self.projectiles.remove_later(index)
+                    projectile_pool.release(projectile)
+            self.projectiles.compact()
 
         for entity in self.entities:
             projectile = entity.turn(self.entities)
             if projectile is not None:
-                self.projectiles.append(projectile)
+                self.add_projectile(projectile)
 
         door = self.current_dungeon.doors_handler.door_check(self.pj)
         if door:
             self.pj.is_crossing_door = True
             self.set_new_room(door)
 
-        self.draw_handler.draw_run(self.pj, self.current_dungeon.enemies, self.objects)
-        pygame.display.update()
+        self.draw_handler.update_run(self.pj, self.current_dungeon.enemies, self.objects)
+
+    def render(self, alpha=1.):
+        """
+        :param alpha: fraction of the next tick already elapsed. The objects are drawn between their positions in the
+        last two ticks, 1 draws the last tick
+        """
+        if HEADLESS:
+            return
+        update_rects = self.draw_handler.draw_run(self.pj, self.current_dungeon.enemies, self.objects, alpha)
+        if update_rects is None:
+            pygame.display.update()
+        elif update_rects:
+            pygame.display.update(update_rects)
 
     def set_new_room(self, door):
         self.change_dungeon(door)
@@ -165,11 +252,11 @@ class DungeonRun(Run):
             enemy.cooldown = len(enemy.animation_database['atacar'][(1, 0)])
 
     def alive_check(self):
-        count = 0
-        for enemy in self.current_dungeon.enemies:
+        enemies = self.current_dungeon.enemies
+        for index, enemy in enemies.snapshot():
             if enemy.hp <= 0:
-                self.current_dungeon.enemies.pop(count)
-            count += 1
+                enemies.remove_later(index)
+        enemies.compact()
 
         if self.pj.hp <= 0:
             is_dead = True
@@ -180,72 +267,37 @@ class MapRun(Run):
 
     def __init__(self, dung_run: DungeonRun):
         super().__init__()
-        self.dungeon_screen = dung_run.draw_handler.dungeon_screen
-        self.intermediate_screen = dung_run.draw_handler.intermediate_screen
-        self.map_dim = dung_run.level_map.map_dim
-        self.visible_rooms = dung_run.level_map.visible_rooms
-        self.current_dungeon = dung_run.current_dungeon
-        self.map_dict = dung_run.level_map.map_dict
+        self.dung_run = dung_run
+        self.level_map = dung_run.level_map
+        self.presenter = dung_run.draw_handler.presenter
+        self.dungeon_screen = None
+        self.intermediate_screen = None
         self.keyboard_handler = MapKeyboardEvents()
 
+    def open(self):
+        """
+        Prepares the map to be shown over the last dungeon frame. The same MapRun is reused every time the map is
+        opened, so only the rooms discovered since the last time are added to the minimap.
+        """
+        self.dungeon_screen = self.dung_run.draw_handler.dungeon_screen
+        self.intermediate_screen = self.dung_run.draw_handler.intermediate_screen
+        self.level_map.update_minimap(self.dung_run.current_dungeon.key)
+        return self
+
+    def run_iteration(self) -> dict:
+        run_output = super(MapRun, self).run_iteration()
+        if run_output is not None and run_output['is_dropped']:
+            # The map has been drawn over the dungeon render targets, so the dungeon is fully redrawn when it is back
+            self.dung_run.draw_handler.needs_full_redraw = True
+        return run_output
+
     def specific_run_iteration(self):
-        self.draw_map(self.dungeon_screen)
+        self.dungeon_screen.blit(self.level_map.minimap, (0, 0))
         self.intermediate_screen.blit(self.dungeon_screen, (WIN_X - DUN_WIN_X - WIN_INF_BORDER_X,
                                                             WIN_Y - DUN_WIN_Y - WIN_INF_BORDER_Y))
-        self.screen.blit(pygame.transform.scale(self.intermediate_screen, self.screen.get_rect().size), (0, 0))
+        self.presenter.present(self.intermediate_screen, self.screen)
         pygame.display.update()
 
-    def draw_map(self, screen):
-        rect_x = 10
-        square_size = 16
-        door_size = 5
-        border_size = 1
-        for x in range(self.map_dim):
-            rect_y = 10
-            for y in range(self.map_dim):
-                name = (x, y)
-                # Draw the rooms
-                if name in self.visible_rooms:
-                    pygame.draw.rect(screen, (200, 200, 200), pygame.Rect(rect_x + border_size, rect_y + border_size,
-                                                                          square_size, square_size))
-                    pygame.draw.rect(screen, (100, 100, 100), pygame.Rect(rect_x + border_size, rect_y + border_size,
-                                                                          square_size, square_size), border_size)
-
-                    if name == self.current_dungeon.key:
-                        pygame.draw.rect(screen, (200, 0, 0), pygame.Rect(rect_x + border_size, rect_y + border_size,
-                                                                          square_size, square_size))
-                        pygame.draw.rect(screen, (100, 100, 100),
-                                         pygame.Rect(rect_x + border_size, rect_y + border_size,
-                                                     square_size, square_size), border_size)
-
-                    # Draw the doors
-                    for direct in self.map_dict[name]:
-                        if direct == 0:
-                            pygame.draw.rect(screen, (0, 0, 255), pygame.Rect(rect_x + int(square_size / 2
-                                                                                           + border_size / 2),
-                                                                              rect_y + square_size - int(door_size / 2)
-                                                                              + border_size, border_size,
-                                                                              door_size))
-                        if direct == 1:
-                            pygame.draw.rect(screen, (0, 0, 255), pygame.Rect(rect_x - int(door_size / 2
-                                                                                           - border_size / 2) + 1,
-                                                                              rect_y + int(square_size / 2)
-                                                                              + border_size,
-                                                                              door_size, border_size))
-                        if direct == 2:
-                            pygame.draw.rect(screen, (0, 0, 255), pygame.Rect(rect_x + int(square_size / 2
-                                                                                           + border_size / 2),
-                                                                              rect_y - int(door_size / 2) + border_size,
-                                                                              border_size, door_size))
-                        if direct == 3:
-                            pygame.draw.rect(screen, (0, 0, 255), pygame.Rect(rect_x + square_size - int(door_size)
-                                                                              + 2 * border_size + 1, rect_y
-                                                                              + int(square_size / 2)
-                                                                              + border_size, door_size, border_size))
-
-                rect_y += square_size - border_size
-            rect_x += square_size - border_size
-
 
 class EndMenuRun(Run):
 
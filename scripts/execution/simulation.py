@@ -0,0 +1,95 @@
+import argparse
+import os
+import random
+import time
+
+# The headless mode must be set before scripts.variables is imported
+os.environ.setdefault('STONEGATE_HEADLESS', '1')
+
+from scripts.execution.run import DungeonRun  # noqa: E402
+
+
+def idle_policy(dungeon_run):
+    pass
+
+
+def random_policy(dungeon_run):
+    """ Moves the pj in a random direction and attacks whenever it can. """
+    pj = dungeon_run.pj
+    pj.axis = [random.choice([-1, 0, 1]), random.choice([-1, 0, 1])]
+    pj.moving = pj.axis != [0, 0]
+    if pj.attack_cooldown <= 0:
+        pj.set_attack_attributes()
+
+
+def explore_policy(dungeon_run):
+    """ Walks towards the closest enemy attacking it or, when the room is empty, towards one of its doors. """
+    pj = dungeon_run.pj
+    targets = dungeon_run.current_dungeon.enemies or [door for door in dungeon_run.current_dungeon.doors_handler.doors
+                                                      if door.exist]
+    if not targets:
+        return random_policy(dungeon_run)
+
+    pj_center = (pj.pos_x + pj.width / 2, pj.pos_y + pj.height / 2)
+    target = min(targets, key=lambda obj: abs(obj.pos_x - pj.pos_x) + abs(obj.pos_y - pj.pos_y))
+    # The first door is kept while the pj is in the room, so it does not go back and forth
+    if not dungeon_run.current_dungeon.enemies:
+        target = targets[hash(dungeon_run.current_dungeon.key) % len(targets)]
+    target_center = (target.pos_x + target.width / 2, target.pos_y + target.height / 2)
+    pj.axis = [int(target_center[0] - pj_center[0] > 2) - int(target_center[0] - pj_center[0] < -2),
+               int(target_center[1] - pj_center[1] > 2) - int(target_center[1] - pj_center[1] < -2)]
+    pj.moving = pj.axis != [0, 0]
+    if dungeon_run.current_dungeon.enemies and pj.attack_cooldown <= 0:
+        pj.set_attack_attributes()
+
+
+class SimulationRun:
+
+    def __init__(self, dungeon_element='tutorial', policy=explore_policy):
+        """
+        Runs the dungeon logic tick by tick without window, audio, keyboard nor frame rate limit.
+        :param dungeon_element: element of the dungeons that are simulated
+        :param policy: function that receives the DungeonRun and sets the pj actions before every tick
+        """
+        self.dungeon_element = dungeon_element
+        self.policy = policy
+        self.dungeon_run = DungeonRun(dungeon_element=dungeon_element)
+        self.ticks = 0
+        self.deaths = 0
+        self.wins = 0
+
+    def simulate(self, n_ticks):
+        """ Simulates n_ticks. When the dungeon ends, a new one is started. """
+        for _ in range(n_ticks):
+            self.policy(self.dungeon_run)
+            run_output = self.dungeon_run.simulate_tick()
+            self.ticks += 1
+            if run_output is not None:
+                if self.dungeon_run.pj.hp <= 0:
+                    self.deaths += 1
+                else:
+                    self.wins += 1
+                self.dungeon_run = DungeonRun(dungeon_element=self.dungeon_element)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulates the dungeon without window nor audio')
+    parser.add_argument('--ticks', type=int, default=10000)
+    parser.add_argument('--element', default='tutorial')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--policy', choices=['explore', 'random', 'idle'], default='explore',
+                        help='how the pj is moved')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    policies = {'explore': explore_policy, 'random': random_policy, 'idle': idle_policy}
+    simulation = SimulationRun(args.element, policies[args.policy])
+    start = time.perf_counter()
+    simulation.simulate(args.ticks)
+    elapsed = time.perf_counter() - start
+    print(f'{simulation.ticks} ticks in {elapsed:.2f}s ({simulation.ticks / elapsed:.0f} ticks/s). '
+          f'Wins: {simulation.wins}, deaths: {simulation.deaths}')
+
+
+if __name__ == '__main__':
+    main()
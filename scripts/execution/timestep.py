@@ -0,0 +1,39 @@
+MAX_TICKS_PER_FRAME = 5
+
+
+class FixedTimestepScheduler:
+    """
+    Accumulates the real time elapsed between rendered frames and tells how many simulation ticks of a fixed duration
+    have to be run. The velocities, cooldowns and lifetimes are counted in ticks, so the game speed does not depend on
+    the render rate.
+    """
+
+    def __init__(self, tick_rate, max_ticks_per_frame=MAX_TICKS_PER_FRAME):
+        """
+        :param tick_rate: simulation ticks per second
+        :param max_ticks_per_frame: the time that needs more ticks is dropped, so a very slow frame slows the game
+        down instead of piling up ticks
+        """
+        self.tick_duration = 1000 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        # The first frame runs a tick, so there is always a simulated state to draw
+        self.accumulator = self.tick_duration
+
+    def advance(self, elapsed_ms):
+        """
+        :param elapsed_ms: milliseconds since the last rendered frame
+        :return: the number of ticks to simulate before rendering
+        """
+        self.accumulator += elapsed_ms
+        n_ticks = int(self.accumulator // self.tick_duration)
+        if n_ticks > self.max_ticks_per_frame:
+            n_ticks = self.max_ticks_per_frame
+            self.accumulator %= self.tick_duration
+        else:
+            self.accumulator -= n_ticks * self.tick_duration
+        return n_ticks
+
+    @property
+    def alpha(self):
+        """ Fraction of the next tick already elapsed, used to interpolate the drawn positions between ticks. """
+        return self.accumulator / self.tick_duration
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class FontCache:
+
+    def __init__(self):
+        """ Keeps the fonts already created, so the font files and the system fonts are not read again. """
+        self.fonts = {}
+
+    def get_font(self, font_path, size):
+        key = ('font', font_path, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(font_path, size)
+        return self.fonts[key]
+
+    def get_sys_font(self, font_names, size):
+        key = ('sys_font', tuple(font_names) if isinstance(font_names, list) else font_names, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(font_names, size)
+        return self.fonts[key]
+
+    def get_freetype_sys_font(self, font_names, size):
+        import pygame.freetype
+
+        key = ('freetype_sys_font', tuple(font_names) if isinstance(font_names, list) else font_names, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.freetype.SysFont(font_names, size)
+        return self.fonts[key]
+
+
+class TextCache:
+
+    def __init__(self, fonts, max_size=128):
+        """
+        Keeps the last rendered texts, so a text that does not change is rendered once and then only blitted.
+        :param fonts: FontCache used to get the fonts
+        :param max_size: number of rendered texts kept. The least recently used one is removed when it is exceeded
+        """
+        self.fonts = fonts
+        self.max_size = max_size
+        self.rendered_texts = OrderedDict()
+
+    def render(self, font_path, size, text, color, antialias=True):
+        key = (font_path, size, text, tuple(color), bool(antialias))
+        if key in self.rendered_texts:
+            self.rendered_texts.move_to_end(key)
+            return self.rendered_texts[key]
+
+        label = self.fonts.get_font(font_path, size).render(text, antialias, color)
+        self.rendered_texts[key] = label
+        if len(self.rendered_texts) > self.max_size:
+            self.rendered_texts.popitem(last=False)
+        return label
+
+
+font_cache = FontCache()
+text_cache = TextCache(font_cache)
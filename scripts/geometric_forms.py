@@ -3,6 +3,10 @@ from dataclasses import dataclass
 
 @dataclass
 class Circle:
+    # A new circle is made every time a circle hitbox moves. The slots are declared by hand instead of slots=True, which
+    # needs Python 3.10
+    __slots__ = ('center_x', 'center_y', 'radius')
+
     center_x: float
     center_y: float
     radius: float
@@ -3,10 +3,21 @@ import random
 import os
 from abc import abstractmethod
 
+import pygame
+
 from scripts.entity.enemies import Moco, Tostada, Conejo, Boca, Boss
 
+from scripts.display_format import asset_preparer
 from scripts.objects import Doors
-from scripts.variables import general_path, DUN_WIN_X, DUN_WIN_Y
+from scripts.utils import LiveList
+from scripts.variables import general_path, DUN_WIN_X, DUN_WIN_Y, bg_img_database
+
+MINIMAP_MARGIN = 10
+MINIMAP_SQUARE_SIZE = 16
+MINIMAP_DOOR_SIZE = 5
+MINIMAP_BORDER_SIZE = 1
+MINIMAP_ROOM_STEP = MINIMAP_SQUARE_SIZE - MINIMAP_BORDER_SIZE
+MINIMAP_COLORKEY = (255, 0, 255)
 
 
 class Map:
@@ -31,6 +42,10 @@ class Map:
         self.exit_room_key = None
         self.room_mapper = eval(dungeon_element.capitalize() + str('Mapper'))
         self.dungeon_element = dungeon_element
+        # Surface with the visible rooms. It is updated only with the rooms that change
+        self.minimap = None
+        self.minimap_rooms = set()
+        self.minimap_current_room = None
 
     @staticmethod
     def read_map_data():
@@ -38,6 +53,78 @@ class Map:
             map_data = json.load(outfile)
         return map_data
 
+    # ------------------------------------------ Minimap ------------------------------------------- #
+    def update_minimap(self, current_room_key):
+        """
+        Draws in the minimap the rooms that have become visible and, if the current room has changed, the previous
+        and the new current rooms. The rest of the minimap is kept from the previous updates.
+        """
+        if self.minimap is None:
+            minimap_size = MINIMAP_MARGIN + self.map_dim * MINIMAP_ROOM_STEP + MINIMAP_DOOR_SIZE + MINIMAP_BORDER_SIZE
+            self.minimap = pygame.Surface((minimap_size, minimap_size))
+            self.minimap.fill(MINIMAP_COLORKEY)
+            self.minimap.set_colorkey(MINIMAP_COLORKEY)
+
+        rooms_to_draw = self.visible_rooms - self.minimap_rooms
+        if current_room_key != self.minimap_current_room:
+            rooms_to_draw |= {current_room_key, self.minimap_current_room} & self.visible_rooms
+            self.minimap_current_room = current_room_key
+
+        for room_key in rooms_to_draw:
+            self.draw_minimap_room(room_key)
+        # The neighbour doors are drawn again because the room squares overlap on their borders
+        for room_key in self.get_visible_neighbours(rooms_to_draw) - rooms_to_draw:
+            self.draw_minimap_doors(room_key)
+        self.minimap_rooms |= rooms_to_draw
+
+    def get_visible_neighbours(self, room_keys):
+        return {(x + mov_x, y + mov_y) for x, y in room_keys for mov_x, mov_y in [(0, 1), (-1, 0), (0, -1), (1, 0)]
+                if (x + mov_x, y + mov_y) in self.visible_rooms}
+
+    @staticmethod
+    def get_minimap_room_position(room_key):
+        return MINIMAP_MARGIN + room_key[0] * MINIMAP_ROOM_STEP, MINIMAP_MARGIN + room_key[1] * MINIMAP_ROOM_STEP
+
+    def draw_minimap_room(self, room_key):
+        rect_x, rect_y = self.get_minimap_room_position(room_key)
+        square_size = MINIMAP_SQUARE_SIZE
+        border_size = MINIMAP_BORDER_SIZE
+        room_color = (200, 0, 0) if room_key == self.minimap_current_room else (200, 200, 200)
+        pygame.draw.rect(self.minimap, room_color, pygame.Rect(rect_x + border_size, rect_y + border_size,
+                                                               square_size, square_size))
+        pygame.draw.rect(self.minimap, (100, 100, 100), pygame.Rect(rect_x + border_size, rect_y + border_size,
+                                                                    square_size, square_size), border_size)
+        self.draw_minimap_doors(room_key)
+
+    def draw_minimap_doors(self, room_key):
+        rect_x, rect_y = self.get_minimap_room_position(room_key)
+        square_size = MINIMAP_SQUARE_SIZE
+        door_size = MINIMAP_DOOR_SIZE
+        border_size = MINIMAP_BORDER_SIZE
+        for direct in self.map_dict[room_key]:
+            if direct == 0:
+                pygame.draw.rect(self.minimap, (0, 0, 255), pygame.Rect(rect_x + int(square_size / 2
+                                                                                     + border_size / 2),
+                                                                        rect_y + square_size - int(door_size / 2)
+                                                                        + border_size, border_size,
+                                                                        door_size))
+            if direct == 1:
+                pygame.draw.rect(self.minimap, (0, 0, 255), pygame.Rect(rect_x - int(door_size / 2
+                                                                                     - border_size / 2) + 1,
+                                                                        rect_y + int(square_size / 2)
+                                                                        + border_size,
+                                                                        door_size, border_size))
+            if direct == 2:
+                pygame.draw.rect(self.minimap, (0, 0, 255), pygame.Rect(rect_x + int(square_size / 2
+                                                                                     + border_size / 2),
+                                                                        rect_y - int(door_size / 2) + border_size,
+                                                                        border_size, door_size))
+            if direct == 3:
+                pygame.draw.rect(self.minimap, (0, 0, 255), pygame.Rect(rect_x + square_size - int(door_size)
+                                                                        + 2 * border_size + 1, rect_y
+                                                                        + int(square_size / 2)
+                                                                        + border_size, door_size, border_size))
+
     # --------------------------------------- Map Generation --------------------------------------- #
     def starting_point(self):
         """
@@ -93,6 +180,9 @@ class Map:
         :return:
         """
         self.visible_rooms = set()
+        self.minimap = None
+        self.minimap_rooms = set()
+        self.minimap_current_room = None
         self.starting_point()
         map_dict = {self.entry_room_key: []}
         self.visible_rooms.add(self.entry_room_key)
@@ -213,6 +303,9 @@ class RoomMapper:
         self.room = self.map_room()
         self.enemies = self.room['enemies']
         self.objects = self.room['objects']
+        # Background with the doors drawn on it. It is built when it is first drawn
+        self.static_layer = None
+        self.static_layer_version = None
 
     def map_room(self):
         if self.exit_room_key == self.key:
@@ -223,9 +316,22 @@ class RoomMapper:
             room = self.generate_general_room()
         return room
 
+    def get_static_layer(self):
+        """
+        Returns the room background with its doors. It is built the first time and rebuilt only when a door
+        changes its state or the images are converted to a new display format.
+        """
+        static_layer_version = (self.doors_handler.state_version, asset_preparer.version)
+        if self.static_layer is None or self.static_layer_version != static_layer_version:
+            bg_name = 'boss_bg' if self.key == self.exit_room_key else 'normal_bg'
+            self.static_layer = bg_img_database[self.dungeon_element][bg_name].copy()
+            self.doors_handler.draw_doors(self.static_layer)
+            self.static_layer_version = static_layer_version
+        return self.static_layer
+
     @staticmethod
     def create_empty_room():
-        return {'enemies': [], 'objects': []}
+        return {'enemies': LiveList(), 'objects': []}
 
     @abstractmethod
     def generate_exit_room(self):
@@ -1,6 +1,8 @@
 import pygame
 import pygame.freetype
 
+from scripts.fonts import font_cache
+
 
 class Text:
 
@@ -21,8 +23,8 @@ class Text:
                      "msgothicmsuigothicmspgothic", "msmincho", "Arial"]
 
         self.FONTNAMES = ",".join(str(x) for x in FONTNAMES)
-        self.Font = pygame.freetype.SysFont(FONTNAMES, font_size)
-        self.FontSmall = pygame.freetype.SysFont(FONTNAMES, font_size)
+        self.Font = font_cache.get_freetype_sys_font(FONTNAMES, font_size)
+        self.FontSmall = font_cache.get_freetype_sys_font(FONTNAMES, font_size)
         print("Using font: " + self.Font.name)
 
         self.TEXTCOLOR = color
@@ -1,5 +1,6 @@
 import pygame
 
+from scripts.display_format import asset_preparer
 from scripts.draw import DrawImage, DrawRectangle
 from scripts.dungeon.hitboxes import RectangleHitbox
 from scripts.magic import WordMagic, magic_dict
@@ -9,6 +10,11 @@ from scripts.variables import projectile_element_list, bg_img_database
 
 class Object:
 
+    __slots__ = ('pos_x', 'pos_y', 'width', 'height', 'axis', 'draw_hitbox', 'img_database', 'frames', 'draw')
+
+    # Hitboxes moved with the object by its movement
+    hitbox_names = ('draw_hitbox', )
+
     def __init__(self, pos_x, pos_y, width, height, axis):
 
         self.pos_x = pos_x
@@ -24,8 +30,12 @@ class Object:
 
 class Door:
 
+    # Slotted, as every room of the level keeps four doors
+    __slots__ = ('pos_x', 'pos_y', 'width', 'height', 'hitbox', 'id_number', 'exist', 'rotation_degree',
+                 'doors_handler', '_state', 'draw', 'draw_hitbox', 'mov', 'opposite_door')
+
     # TODO: add lock_door_img
-    def __init__(self, pos_x, pos_y, width, height, id_number, mov, database_img, rotation_degree, state='open'):
+    def __init__(self, pos_x, pos_y, width, height, id_number, mov, doors_handler, rotation_degree, state='open'):
         """
         :param pos_x:
         :param pos_y:
@@ -33,7 +43,7 @@ class Door:
         :param height:
         :param id_number:
         :param mov:
-        :param database_img:
+        :param doors_handler: Doors that creates the door. It provides the rotated door images
         :param rotation_degree:
         :param state: can be open, lock
         """
@@ -45,39 +55,72 @@ class Door:
         self.hitbox = RectangleHitbox(pos_x, pos_y, width, height)
 
         self.id_number = id_number
-        self.state = state
         self.exist = False
-        self.database_img = database_img
         self.rotation_degree = rotation_degree
-
-        img = self.database_img[self.state]
-        final_img = pygame.transform.rotate(img, self.rotation_degree)
-        self.draw = DrawImage(self, final_img)  # TODO: make dynamic draw image (change with the state)
+        self.doors_handler = doors_handler
+        self._state = None
+        self.draw = None
+        self.state = state
 
         self.draw_hitbox = RectangleHitbox(pos_x, pos_y, width, height)
 
         self.mov = mov
         self.opposite_door = None
 
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        """ Changes the door image with the state and tells the doors handler, so the room static layer is rebuilt. """
+        if state != self._state:
+            self._state = state
+            self.update_draw()
+            self.doors_handler.state_version += 1
+
+    def update_draw(self):
+        final_img = self.doors_handler.get_rotated_door_img(self.state, self.rotation_degree)
+        self.draw = DrawImage(self, final_img)
+
 
 class Doors:
+
+    # Rotated door images shared by every Doors handler | (element, state, rotation_degree): image
+    rotated_door_img_cache = {}
+    # asset_preparer version of the cached images. The cache is emptied when the images are converted again
+    rotated_door_img_cache_version = 0
+
     # TODO: add lock_door_img
     def __init__(self, dungeon_element):
+        self.dungeon_element = dungeon_element
         self.door_img_database = bg_img_database[dungeon_element]['door']
         self.doors = []
+        # Increased every time a door changes its state
+        self.state_version = 0
+        self.assets_version = asset_preparer.version
+
+    def get_rotated_door_img(self, state, rotation_degree):
+        if Doors.rotated_door_img_cache_version != asset_preparer.version:
+            Doors.rotated_door_img_cache.clear()
+            Doors.rotated_door_img_cache_version = asset_preparer.version
+        key = (self.dungeon_element, state, rotation_degree)
+        if key not in self.rotated_door_img_cache:
+            self.rotated_door_img_cache[key] = pygame.transform.rotate(self.door_img_database[state], rotation_degree)
+        return self.rotated_door_img_cache[key]
 
     def create_doors(self, x, y):
         rect = self.door_img_database['open'].get_rect()
         width = rect.height
         height = rect.width
         door1 = Door(pos_x=int(x / 2) - height / 2, pos_y=y - width - 6, width=height, height=width, id_number=0,
-                     mov=(0, 1), rotation_degree=180, database_img=self.door_img_database)
+                     mov=(0, 1), rotation_degree=180, doors_handler=self)
         door2 = Door(pos_x=6, pos_y=int(y / 2) - height / 2, width=width, height=height, id_number=1, mov=(-1, 0),
-                     rotation_degree=90, database_img=self.door_img_database)
+                     rotation_degree=90, doors_handler=self)
         door3 = Door(pos_x=int(x / 2) - height / 2, pos_y=6, width=height, height=width, id_number=2, mov=(0, -1),
-                     rotation_degree=0, database_img=self.door_img_database)
+                     rotation_degree=0, doors_handler=self)
         door4 = Door(pos_x=x - width - 6, pos_y=int(y / 2) - height / 2, width=width, height=height, id_number=0,
-                     mov=(1, 0), rotation_degree=270, database_img=self.door_img_database)
+                     mov=(1, 0), rotation_degree=270, doors_handler=self)
 
         door1.opposite_door = door3
         door2.opposite_door = door4
@@ -90,6 +133,11 @@ class Doors:
         self.doors.append(door4)
 
     def draw_doors(self, screen):
+        if self.assets_version != asset_preparer.version:
+            # The door images have been converted to a new display format
+            for door in self.doors:
+                door.update_draw()
+            self.assets_version = asset_preparer.version
         for idx, door in enumerate(self.doors):
             if door.state == 'open' and door.exist:
                 door.draw.draw(screen)
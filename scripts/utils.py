@@ -1,28 +1,108 @@
 import pygame
 import os
-import configparser
 import json
 
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 
 from typing import Union
+from scripts.animation import AnimationClip
+from scripts.atlas import pack_animation_database
+from scripts.display_format import convert_image
 from scripts.geometric_forms import Circle
 
 
+# AssetPack with the baked images. When it is set, the images are read from it instead of decoding the png files
+asset_pack = None
+
+
+def set_asset_pack(pack):
+    global asset_pack
+    asset_pack = pack
+
+
+def list_images(img_dir):
+    if asset_pack is not None:
+        return asset_pack.list_images(img_dir)
+    return glob(os.path.join(img_dir, "*.png"))
+
+
+def load_image(img_path):
+    if asset_pack is not None and asset_pack.contains(img_path):
+        return asset_pack.load(img_path)
+    return pygame.image.load(img_path)
+
+
+# Thread pool shared by every image load. It is made with the first load, as the images are loaded lazily
+decode_executor = None
+
+
+def get_decode_executor():
+    global decode_executor
+    if decode_executor is None:
+        decode_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return decode_executor
+
+
+def decode_images(images_path):
+    """
+    Reads and decodes the images in the shared thread pool. The surfaces are returned in the same order without
+    converting them, because the conversion must be done in the main thread once the display exists.
+    """
+    return list(get_decode_executor().map(load_image, images_path))
+
+
 def load_animation(path, folder_type, folder_dir, frame_duration):
-    animation_frame_data = []
     img_dir = os.path.join(path, folder_type, folder_dir)
-    images_path = glob(os.path.join(img_dir, "*.png"))
-    for img_path in images_path:
-        animation_image = pygame.image.load(img_path).convert_alpha()
-        for i in range(frame_duration):
-            animation_frame_data.append(animation_image.copy())
-    return animation_frame_data
+    images_path = list_images(img_dir)
+    animation_images = [convert_image(image) for image in decode_images(images_path)]
+    return AnimationClip(animation_images, frame_duration)
+
+
+class LazyDatabase(dict):
+    """
+    Dictionary that loads the value of a key the first time it is accessed and caches it for the next accesses.
+    :param loader: function that receives the missing key and returns its value
+    """
+
+    def __init__(self, loader):
+        super(LazyDatabase, self).__init__()
+        self.loader = loader
+
+    def __missing__(self, key):
+        value = self.loader(key)
+        self[key] = value
+        return value
+
+
+class LiveList(list):
+    """
+    List of the live projectiles or enemies of a room. The objects to remove are marked while the list is iterated and
+    removed all together once per tick by swapping them with the last ones, so no object is skipped in the iteration
+    and each removal is O(1). The order of the objects is not kept.
+    """
+
+    def __init__(self, iterable=()):
+        super(LiveList, self).__init__(iterable)
+        self.removed_indexes = []
 
+    def snapshot(self):
+        """ Yields the indexes and objects of the list when it is called. The objects appended meanwhile are not. """
+        for index in range(len(self)):
+            yield index, self[index]
 
-def argsort(seq):
-    return sorted(range(len(seq)), key=seq.__getitem__)
+    def remove_later(self, index):
+        """ Marks the object of the index to be removed in the next compact. """
+        self.removed_indexes.append(index)
+
+    def compact(self):
+        """ Removes the marked objects, moving the last objects of the list to their places. """
+        for index in sorted(set(self.removed_indexes), reverse=True):
+            last_object = self.pop()
+            if index < len(self):
+                self[index] = last_object
+        self.removed_indexes.clear()
 
 
 def collision_between_two_objects(hitbox1: Union[pygame.Rect, Circle], hitbox2: Union[pygame.Rect, Circle]):
@@ -60,96 +140,37 @@ def collision_rect_circ(rect_hitbox: pygame.Rect, circ_hitbox: Circle) -> bool:
         return True
 
 
-def get_config_parser_generic_parameters(path):
-    raw_configparser = configparser.RawConfigParser()
-    config_path = os.path.join(path, "configuration_file.cfg")
-    raw_configparser.read(config_path)
-    return raw_configparser
-
-
-def get_pj_constants(path):
-    raw_configparser = get_config_parser_generic_parameters(path)
-    searcher = dict(raw_configparser.items("PJ"))
-    constants = {key: eval(value) for key, value in searcher.items()}
-    return constants
-
-
-def get_enemy_constants(path):
-    enemies_path = glob("Images/enemies/*", recursive=False)
-    constants = {}
-    for enemy_path in enemies_path:
-        enemy_name = enemy_path.split(os.sep)[-1]
-        raw_configparser = get_config_parser_generic_parameters(path)
-        searcher = dict(raw_configparser.items(enemy_name.upper()))
-
-        enemy_constants = {key: eval(value) for key, value in searcher.items()}
-        constants[enemy_name] = enemy_constants
-    return constants
-
-
 def load_individual_entity_animation_database(image_directory, dict_actions, frame_duration):
-    animation_database = {}
+    folders_images_path = {}
     for folder_type in dict_actions.keys():
-        animation_dir_database = {}
         for directory in dict_actions[folder_type].keys():
             folder_dir = dict_actions[folder_type][directory]
-            animation_dir_database[directory] = load_animation(image_directory, folder_type, folder_dir,
-                                                               frame_duration)
-        animation_database[folder_type] = animation_dir_database
-
-    return animation_database
-
-
-def load_enemy_animation_database(general_path, enemies_img_path, dict_actions):
-    enemies_path = glob("Images/enemies/*", recursive=False)
-    enemy_animation_database = {}
-    enemy_constants = get_enemy_constants(os.path.join(general_path, 'configurations'))
-    for enemy_path in enemies_path:
-        enemy_name = os.path.split(enemy_path)[-1]
-
-        frame_duration = enemy_constants[enemy_name]["frame_duration"]
-        animation_database = load_individual_entity_animation_database(os.path.join(enemies_img_path, enemy_name),
-                                                                       dict_actions, frame_duration)
-        enemy_animation_database[enemy_name] = animation_database
-
-    return enemy_animation_database
+            folders_images_path[(folder_type, directory)] = list_images(os.path.join(image_directory, folder_type,
+                                                                                     folder_dir))
 
+    # All the folders are decoded together so the thread pool is kept busy
+    decoded_images = iter(decode_images([img_path for images_path in folders_images_path.values()
+                                         for img_path in images_path]))
+    animation_database = {}
+    for (folder_type, directory), images_path in folders_images_path.items():
+        animation_images = [convert_image(next(decoded_images)) for _ in images_path]
+        animation_database.setdefault(folder_type, {})[directory] = AnimationClip(animation_images, frame_duration)
 
-def get_projectiles_constants(path):
-    raw_configparser = get_config_parser_generic_parameters(path)
-
-    elements = ['air', 'fire', 'water', 'darkness', 'light']
-
-    constants = {}
-    for element in elements:
-        searcher = dict(raw_configparser.items(element.upper()))
-        elem_constants = {key: eval(value) for key, value in searcher.items()}
-        constants[element] = elem_constants
-
-    return constants
+    pack_animation_database(animation_database)
+    return animation_database
 
 
-def get_screen_constants(path):
-    raw_configparser = get_config_parser_generic_parameters(path)
-    searcher = dict(raw_configparser.items("SCREEN"))
-    win_x = int(searcher.get("win_x"))
-    win_y = int(searcher.get("win_y"))
-    dun_win_x = int(searcher.get("dun_win_x"))
-    dun_win_y = int(searcher.get("dun_win_y"))
-    win_inf_border_x = int(searcher.get("win_inf_border_x"))
-    win_inf_border_y = int(searcher.get("win_inf_border_y"))
-    dun_border_x = int(searcher.get("dun_border_x"))
-    dun_border_y = int(searcher.get("dun_border_y"))
-    return win_x, win_y, dun_win_x, dun_win_y, win_inf_border_x, win_inf_border_y, dun_border_x, dun_border_y
+def load_projectile_animation(projectile_path, element, frame_duration):
+    animation_clip = load_animation(projectile_path, element, 'frames', frame_duration)
+    pack_animation_database(animation_clip)
+    return animation_clip
 
 
-def get_music_constants(path):
-    raw_configparser = get_config_parser_generic_parameters(path)
-    searcher = dict(raw_configparser.items("MUSIC"))
-    vol_ratio_hit = float(searcher.get("vol_ratio_hit"))
-    vol_ratio_mons_dead = float(searcher.get("vol_ratio_mons_dead"))
-    vol_ratio_att = float(searcher.get("vol_ratio_att"))
-    return vol_ratio_hit, vol_ratio_mons_dead, vol_ratio_att
+def load_background_database(bg_path, element):
+    door_img = convert_image(load_image(os.path.join(bg_path, element, 'mazmorra_puerta.png')))
+    return {'normal_bg': convert_image(load_image(os.path.join(bg_path, element, 'mazmorra.png'))),
+            'door': {'open': door_img, 'locked': door_img},
+            'boss_bg': convert_image(load_image(os.path.join(bg_path, element, 'boss_mazmorra.png')))}
 
 
 def save_dyn_params(path, parameters):
@@ -1,24 +1,47 @@
 import pathlib
 import os
+import threading
 import pygame
 import scripts.utils as utils
+from scripts.asset_pack import open_asset_pack
+from scripts.config import load_game_config
+from scripts.display_format import asset_preparer
+from scripts.fonts import font_cache
 
 
+# -------------------------------------- Headless mode ----------------------------------------
+# STONEGATE_HEADLESS=1 runs the game logic without window nor audio: the assets are kept as plain surfaces and
+# nothing is drawn. It is used for simulations (python -m scripts.execution.simulation)
+HEADLESS = os.environ.get('STONEGATE_HEADLESS', '0') == '1'
+if HEADLESS:
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
 # -------------------------------------- Entity Variables ----------------------------------------
 pygame.init()
 
 general_path = pathlib.Path(os.path.dirname(__file__)).parent
 general_path = utils.resource_path(general_path)
 
-pj_constants = utils.get_pj_constants(os.path.join(general_path, 'configurations'))
-enemy_constants = utils.get_enemy_constants(os.path.join(general_path, 'configurations'))
+# Baked images made with "python -m scripts.asset_pack". Without them, the png files are decoded
+utils.set_asset_pack(open_asset_pack(os.path.join(general_path, 'Images')))
+
+game_config = load_game_config(os.path.join(general_path, 'configurations'))
+
+pj_constants = game_config.pj
+enemy_constants = game_config.enemies
 
-projectiles_constants = utils.get_projectiles_constants(os.path.join(general_path, 'configurations'))
+projectiles_constants = game_config.projectiles
 
 # -------------------------------------------- Display -----------------------------------------------
 
-(WIN_X, WIN_Y, DUN_WIN_X, DUN_WIN_Y, WIN_INF_BORDER_X, WIN_INF_BORDER_Y, DUN_BORDER_X,
- DUN_BORDER_Y) = utils.get_screen_constants(os.path.join(general_path, 'configurations'))
+WIN_X, WIN_Y = game_config.screen.win_x, game_config.screen.win_y
+DUN_WIN_X, DUN_WIN_Y = game_config.screen.dun_win_x, game_config.screen.dun_win_y
+WIN_INF_BORDER_X, WIN_INF_BORDER_Y = game_config.screen.win_inf_border_x, game_config.screen.win_inf_border_y
+DUN_BORDER_X, DUN_BORDER_Y = game_config.screen.dun_border_x, game_config.screen.dun_border_y
+
+render_constants = game_config.render
+simulation_constants = game_config.simulation
 
 dyn_params = utils.load_dyn_params(os.path.join(general_path, 'configurations'))
 
@@ -37,10 +60,26 @@ first_screen_loc_y = monitor_size[1] / 2 - screen_sizes[-1][1] / 2
 
 os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (first_screen_loc_x, first_screen_loc_y)
 
-screen = pygame.display.set_mode((first_win_x, first_win_y), pygame.RESIZABLE)
+# Held while the window is changed or presented, because the frames can be presented from a worker thread
+display_lock = threading.Lock()
+
+
+def set_screen_mode(size):
+    """
+    Sets the window size and keeps the loaded images in the display format. In headless mode there is no window, so a
+    plain surface of that size is returned.
+    """
+    if HEADLESS:
+        return pygame.Surface(size)
+    with display_lock:
+        screen_surface = pygame.display.set_mode(size, pygame.RESIZABLE)
+    asset_preparer.prepare()
+    return screen_surface
+
+
+screen = set_screen_mode((first_win_x, first_win_y))
 
 pygame.font.init()
-myfont = pygame.font.SysFont('arial', 30)
 
 FPS = 30
 
@@ -54,18 +93,29 @@ enemies_img_path = os.path.join(img_path, 'enemies')
 basic_element_list = ['fire', 'water', 'darkness', 'light']
 element_list = basic_element_list
 
-logo_img = pygame.image.load(os.path.join(img_path, 'logo.ico')).convert_alpha()
-pygame.display.set_icon(logo_img)
+if not HEADLESS:
+    logo_img = pygame.image.load(os.path.join(img_path, 'logo.ico')).convert_alpha()
+    pygame.display.set_icon(logo_img)
 
 dict_actions = {action_type: {(0, -1): 'arriba', (0, 1): 'abajo', (1, 0): 'derecha',
                 (-1, 0): 'izquierda'} for action_type in ['caminar_atacar', 'caminar', 'parada', 'atacar']}
 
+# Assets are loaded on first access and cached, so only the entities and elements used in a run are loaded
+
 # Pj
 
-pj_animation_database = utils.load_individual_entity_animation_database(os.path.join(img_path, "protagonista"),
-                                                                        dict_actions, 4)
 
-enemy_animation_database = utils.load_enemy_animation_database(general_path, enemies_img_path, dict_actions)
+def load_pj_animation_database():
+    animation_database = utils.load_individual_entity_animation_database(os.path.join(img_path, "protagonista"),
+                                                                         dict_actions, 4)
+    asset_preparer.add_animation_database(animation_database)
+    return animation_database
+
+
+enemy_animation_database = utils.LazyDatabase(
+    lambda enemy_name: utils.load_individual_entity_animation_database(
+        os.path.join(enemies_img_path, enemy_name), dict_actions, enemy_constants[enemy_name].frame_duration))
+asset_preparer.add_animation_database(enemy_animation_database)
 
 # Background
 
@@ -73,46 +123,63 @@ bg_path = os.path.join(img_path, 'fondos')
 
 bg_element_list = element_list + ['tutorial']
 
-bg_img_database = {element: {'normal_bg': pygame.image.load(os.path.join(bg_path, element,
-                                                                         'mazmorra.png')).convert_alpha(),
-                             'door': {'open': pygame.image.load(os.path.join(bg_path, element,
-                                                                             'mazmorra_puerta.png')).convert_alpha(),
-                                      'locked': pygame.image.load(os.path.join(bg_path, element,
-                                                                               'mazmorra_puerta.png')).convert_alpha()
-                                      },
-                             'boss_bg': pygame.image.load(os.path.join(bg_path, element,
-                                                                       'boss_mazmorra.png')).convert_alpha()}
-                   for element in bg_element_list}
+bg_img_database = utils.LazyDatabase(lambda element: utils.load_background_database(bg_path, element))
+asset_preparer.add_image_database(bg_img_database)
 
 # Projectiles
 
 projectile_element_list = element_list + ['air']
 
 projectile_path = os.path.join(img_path, 'projectiles')
-projectile_img_database = {elem: utils.load_animation(projectile_path, elem, 'frames',
-                                                      frame_duration=projectiles_constants[elem]['frame_duration'])
-                           for elem in projectile_element_list}
+projectile_img_database = utils.LazyDatabase(
+    lambda elem: utils.load_projectile_animation(projectile_path, elem,
+                                                 frame_duration=projectiles_constants[elem].frame_duration))
+asset_preparer.add_animation_database(projectile_img_database)
 
 
 # ------------------------------------------------ Music -------------------------------------------
 
 music_vol = dyn_params['music']['music_vol']
 
-vol_ratio_hit, vol_ratio_mons_dead, vol_ratio_att = utils.get_music_constants(os.path.join(general_path,
-                                                                                           'configurations'))
+vol_ratio_hit = game_config.music.vol_ratio_hit
+vol_ratio_mons_dead = game_config.music.vol_ratio_mons_dead
+vol_ratio_att = game_config.music.vol_ratio_att
+
+music_path = os.path.join(general_path, 'Music')
+
+
+def start_music():
+    if HEADLESS:
+        return
+    pygame.mixer.music.load(os.path.join(music_path, 'PRUEBA_AGOSTO_LOOP_retocada.mp3'))
+    pygame.mixer.music.play(-1)  # -1 infinitely
+    pygame.mixer.pre_init(channels=1)  # channel 1:mono 2:stereo
+    pygame.mixer.music.set_volume(music_vol)
+
 
-pygame.mixer.music.load(os.path.join(general_path, 'Music', 'PRUEBA_AGOSTO_LOOP_retocada.mp3'))
-pygame.mixer.music.play(-1)  # -1 infinitely
-pygame.mixer.pre_init(channels=1)  # channel 1:mono 2:stereo
-pygame.mixer.music.set_volume(music_vol)
+def load_sound(file_name, vol_ratio):
+    sound = pygame.mixer.Sound(os.path.join(music_path, file_name))
+    sound.set_volume(vol_ratio * music_vol)
+    return sound
 
-hit_sound = pygame.mixer.Sound(os.path.join(general_path, 'Music', 'Resto_vida.wav'))
-hit_sound.set_volume(vol_ratio_hit*music_vol)
-monster_dead_sound = pygame.mixer.Sound(os.path.join(general_path, 'Music', 'Muerte_monstruo.wav'))
-monster_dead_sound.set_volume(vol_ratio_mons_dead*music_vol)
-attack_sound = pygame.mixer.Sound(os.path.join(general_path, 'Music', 'desenvainar_espada.wav'))
-attack_sound.set_volume(vol_ratio_att*music_vol)
 
 # --------------------------------------------- Fonts ----------------------------------
 
 fonts_mapper = {'arial': os.path.join(general_path, 'Fonts', 'Arial.ttf')}
+
+# ------------------------------------------ Lazy attributes ---------------------------------
+
+_lazy_attributes = {'pj_animation_database': load_pj_animation_database,
+                    'myfont': lambda: font_cache.get_sys_font('arial', 30),
+                    'hit_sound': lambda: load_sound('Resto_vida.wav', vol_ratio_hit),
+                    'monster_dead_sound': lambda: load_sound('Muerte_monstruo.wav', vol_ratio_mons_dead),
+                    'attack_sound': lambda: load_sound('desenvainar_espada.wav', vol_ratio_att)}
+
+
+def __getattr__(name):
+    """ Loads the heavy module attributes the first time they are imported and caches them in the module. """
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _lazy_attributes[name]()
+    globals()[name] = value
+    return value